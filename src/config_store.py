@@ -4,8 +4,10 @@ import json
 import os
 import shutil
 import uuid
+from contextlib import contextmanager
 from dataclasses import asdict, dataclass
 from pathlib import Path
+from typing import Iterator
 
 from util.filehash import sha256_file
 from util.paths import app_data_dir, config_path, ensure_dirs
@@ -40,6 +42,7 @@ class AppConfig:
     chat_bg_color: str
     chat_bg_opacity: int
     chat_bg_image_path: str
+    disable_animations: bool
 
 
 class ConfigStore:
@@ -66,6 +69,7 @@ class ConfigStore:
             chat_bg_color="#000000",
             chat_bg_opacity=12,
             chat_bg_image_path="",
+            disable_animations=False,
         )
 
     def load(self) -> AppConfig:
@@ -90,6 +94,7 @@ class ConfigStore:
                     chat_bg_color=raw.get("chat_bg_color") or "#000000",
                     chat_bg_opacity=int(raw.get("chat_bg_opacity", 12)),
                     chat_bg_image_path=raw.get("chat_bg_image_path") or "",
+                    disable_animations=bool(raw.get("disable_animations", False)),
                 )
             except Exception:
                 self.config = self._default_config()
@@ -119,7 +124,20 @@ class ConfigStore:
 
     def save(self) -> None:
         ensure_dirs()
-        self.path.write_text(json.dumps(asdict(self.config), indent=2, ensure_ascii=False), encoding="utf-8")
+        data = json.dumps(asdict(self.config), indent=2, ensure_ascii=False).encode("utf-8")
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    @contextmanager
+    def mutate(self) -> Iterator[AppConfig]:
+        before = asdict(self.config)
+        yield self.config
+        if asdict(self.config) != before:
+            self.save()
 
     def set_avatar_from_path(self, src_path: str) -> None:
         src = Path(src_path)
@@ -144,4 +162,4 @@ class ConfigStore:
             except Exception:
                 pass
         self.config.avatar_path = ""
-        self.config.avatar_sha256 = ""
+        self.config.avatar_sha256 = ""
@@ -1,45 +1,116 @@
 from __future__ import annotations
 
+import atexit
+import hashlib
 import logging
+import os
+import queue
 import sys
 import threading
-from logging.handlers import RotatingFileHandler
+from functools import lru_cache
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
+from typing import Any, Callable, Iterable
 
-from PySide6.QtCore import QAbstractAnimation, QPropertyAnimation, QSize, Qt, QSettings, QTimer, QRect
-from PySide6.QtGui import QColor, QImage, QPainter, QPixmap
-from PySide6.QtSvg import QSvgRenderer
+from PySide6.QtCore import QAbstractAnimation, QObject, QPropertyAnimation, QSize, Qt, QSettings, QTimer, QRect
+from PySide6.QtGui import QColor, QImage, QPainter, QPixmap, QPixmapCache
 from PySide6.QtWidgets import QApplication, QGraphicsOpacityEffect, QSplashScreen
 
 from config_store import ConfigStore
+from net import protocol
 from net.message_store import HistoryStore
 from net.multicast import LanChatNetwork
-from net.api_service import ApiService
 from theme import apply_theme
 from tray import TrayManager
-from ui_about import AboutDialog
-from ui_language import LanguageDialog
 from ui_main import MainWindow
-from ui_settings import SettingsDialog
+from util.filehash import copy_file_sha256, sha256_file
 from util.images import app_icon
-from util.paths import ensure_dirs, history_path, logs_dir
+from util.paths import attachment_cache_path, cache_dir, ensure_dirs, history_path, logs_dir
 from util.sound import play_notification
 from util.i18n import set_language, t
 
+HISTORY_PAGE_SIZE = 200
+SPLASH_COLOR = QColor("#00ff66")
+SPLASH_ALIGN = Qt.AlignBottom | Qt.AlignHCenter
+
+
+class FastRotatingFileHandler(RotatingFileHandler):
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        try:
+            self._bytes_written = self.stream.tell() if self.stream else 0
+        except Exception:
+            self._bytes_written = 0
+
+    def format(self, record: logging.LogRecord) -> str:
+        msg = super().format(record)
+        self._bytes_written += len(msg) + 1
+        return msg
+
+    def shouldRollover(self, record: logging.LogRecord) -> bool:  # noqa: N802 - logging naming
+        if self.maxBytes <= 0 or self._bytes_written < self.maxBytes:
+            return False
+        if super().shouldRollover(record):
+            return True
+        try:
+            self._bytes_written = self.stream.tell()
+        except Exception:
+            self._bytes_written = 0
+        return False
+
+    def doRollover(self) -> None:  # noqa: N802 - logging naming
+        super().doRollover()
+        self._bytes_written = 0
+
 
 def setup_logging() -> None:
     ensure_dirs()
     log_file = logs_dir() / "app.log"
-    handler = RotatingFileHandler(log_file, maxBytes=1_000_000, backupCount=3, encoding="utf-8")
+    handler = FastRotatingFileHandler(log_file, maxBytes=10_000_000, backupCount=3, encoding="utf-8")
     formatter = logging.Formatter("%(asctime)s [%(levelname)s] %(name)s: %(message)s")
     handler.setFormatter(formatter)
 
+    log_queue: queue.Queue = queue.Queue(-1)
+    listener = QueueListener(log_queue, handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+
     root = logging.getLogger()
     root.setLevel(logging.INFO)
-    root.addHandler(handler)
+    root.addHandler(QueueHandler(log_queue))
+
+
+@lru_cache(maxsize=1)
+def _get_settings_cls():
+    from ui_settings import SettingsDialog
+
+    return SettingsDialog
+
+
+@lru_cache(maxsize=1)
+def _get_show_about():
+    from ui_about import show_about
+
+    return show_about
+
+
+@lru_cache(maxsize=1)
+def _get_language_cls():
+    from ui_language import LanguageDialog
+
+    return LanguageDialog
+
+
+@lru_cache(maxsize=1)
+def _get_api_service_cls():
+    from net.api_service import ApiService
+
+    return ApiService
 
 
 def _render_svg_to_pixmap(svg_path: Path, target_size: QSize, dpr: float) -> QPixmap:
+    from PySide6.QtSvg import QSvgRenderer
+
     renderer = QSvgRenderer(str(svg_path))
     if not renderer.isValid():
         return QPixmap()
@@ -61,7 +132,7 @@ def _fallback_splash_pixmap(target_size: QSize, dpr: float) -> QPixmap:
     image = QImage(width, height, QImage.Format_ARGB32_Premultiplied)
     image.fill(QColor("#050607"))
     painter = QPainter(image)
-    painter.setPen(QColor("#00ff66"))
+    painter.setPen(SPLASH_COLOR)
     painter.drawText(image.rect(), Qt.AlignCenter, t("splash.fallback_title"))
     painter.end()
     pixmap = QPixmap.fromImage(image)
@@ -69,6 +140,30 @@ def _fallback_splash_pixmap(target_size: QSize, dpr: float) -> QPixmap:
     return pixmap
 
 
+def _load_splash_pixmap(svg_path: Path, target_size: QSize, dpr: float) -> QPixmap:
+    cache_path = None
+    try:
+        seed = f"{svg_path.stat().st_mtime_ns}|{target_size.width()}|{target_size.height()}|{dpr}"
+        key = hashlib.sha1(seed.encode("utf-8")).hexdigest()
+        cache_path = cache_dir() / f"splash_{key}.png"
+        if cache_path.exists():
+            pixmap = QPixmap(str(cache_path))
+            if not pixmap.isNull():
+                pixmap.setDevicePixelRatio(dpr)
+                return pixmap
+    except Exception:
+        cache_path = None
+    pixmap = _render_svg_to_pixmap(svg_path, target_size, dpr)
+    if cache_path is not None and not pixmap.isNull():
+        try:
+            for stale in cache_path.parent.glob("splash_*.png"):
+                stale.unlink()
+            pixmap.save(str(cache_path), "PNG")
+        except Exception:
+            pass
+    return pixmap
+
+
 def _create_splash(app: QApplication) -> QSplashScreen | None:
     screen = app.primaryScreen()
     if screen is None:
@@ -80,7 +175,7 @@ def _create_splash(app: QApplication) -> QSplashScreen | None:
     dpr = screen.devicePixelRatio() or 1.0
     base_path = Path(getattr(sys, "_MEIPASS", Path(__file__).resolve().parent))
     svg_path = base_path / "assets" / "splash.svg"
-    pixmap = _render_svg_to_pixmap(svg_path, size, dpr) if svg_path.exists() else QPixmap()
+    pixmap = _load_splash_pixmap(svg_path, size, dpr) if svg_path.exists() else QPixmap()
     if pixmap.isNull():
         pixmap = _fallback_splash_pixmap(size, dpr)
     splash = QSplashScreen(pixmap)
@@ -88,24 +183,143 @@ def _create_splash(app: QApplication) -> QSplashScreen | None:
     return splash
 
 
+class _ApiState:
+    def __init__(self, history: HistoryStore, store: ConfigStore) -> None:
+        self._history = history
+        self._store = store
+        self._peers: tuple[dict, ...] = ()
+        self._pinned: dict | None = None
+
+    def update_peers(self, peers: list[dict]) -> None:
+        self._peers = tuple(peers)
+
+    def get_peers(self) -> list[dict]:
+        return list(self._peers)
+
+    def update_pinned(self, pinned: dict | None) -> None:
+        self._pinned = dict(pinned) if pinned else None
+
+    def get_pinned(self) -> dict | None:
+        return self._pinned
+
+    def get_history(self, limit: int | None = None, before: str | None = None) -> list[dict]:
+        return self._history.tail(limit, before)
+
+    def get_message(self, message_id: str) -> dict | None:
+        return self._history.get(message_id)
+
+    def get_self(self) -> dict:
+        config = self._store.config
+        return {
+            "sender_id": config.sender_id,
+            "name": config.user_name,
+            "avatar_sha256": config.avatar_sha256,
+        }
+
+
+@lru_cache(maxsize=4)
+def _api_sender_name(name: str) -> str:
+    base_name = (name or "").strip() or t("user.unknown")
+    suffix = " (API)"
+    if base_name.endswith(suffix):
+        return base_name
+    return f"{base_name}{suffix}"
+
+
+class _Debouncer(QObject):
+    def __init__(self, callback: Callable[[Any], None], interval_ms: int = 80, parent: QObject | None = None) -> None:
+        super().__init__(parent)
+        self._callback = callback
+        self._pending: Any = None
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self._fire)
+
+    def schedule(self, payload: Any) -> None:
+        self._pending = payload
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def _fire(self) -> None:
+        payload = self._pending
+        self._pending = None
+        self._callback(payload)
+
+
+_SUBTYPE_DISPATCH: dict[str, Callable[[MainWindow, dict], Any]] = {
+    "REACT": lambda w, m: w.apply_reaction(m.get("target_id", ""), m.get("emoji", ""), m.get("sender_id", "")),
+    "EDIT": lambda w, m: w.apply_edit(m.get("target_id", ""), m.get("text", "")),
+    "UNDO": lambda w, m: w.apply_undo(m.get("target_id", "")),
+    "PIN": lambda w, m: w.apply_pin(m.get("target_id", ""), m.get("preview", ""), m.get("name", "")),
+    "UNPIN": lambda w, m: w.apply_unpin(m.get("target_id", "")),
+}
+
+
+def _fold_history(
+    messages: Iterable[dict], own_sender_id: str
+) -> tuple[list[dict], dict[str, list[dict]], dict | None, list[tuple[str, str]]]:
+    visible: list[dict] = []
+    reactions: dict[tuple[str, str, str], dict] = {}
+    edits: dict[str, tuple[int, dict]] = {}
+    undos: dict[str, tuple[int, dict]] = {}
+    pin: dict | None = None
+    cached_files: list[tuple[str, str]] = []
+    for index, msg in enumerate(messages):
+        if msg.get("t") == "CHAT" and msg.get("subtype"):
+            subtype = msg.get("subtype")
+            target_id = msg.get("target_id", "")
+            if subtype == "REACT":
+                reactions.setdefault((target_id, msg.get("emoji", ""), msg.get("sender_id", "")), msg)
+            elif subtype == "EDIT":
+                edits[target_id] = (index, msg)
+            elif subtype == "UNDO":
+                undos[target_id] = (index, msg)
+            elif subtype in ("PIN", "UNPIN"):
+                pin = msg
+            continue
+        visible.append(msg)
+        if msg.get("t") == "FILE" and msg.get("sender_id") == own_sender_id:
+            file_id = msg.get("file_id")
+            filename = msg.get("filename") or ""
+            if file_id and filename:
+                cached_files.append((file_id, filename))
+    controls: dict[str, list[dict]] = {}
+    for (target_id, _emoji, _sender), msg in reactions.items():
+        controls.setdefault(target_id, []).append(msg)
+    for target_id, (_index, msg) in sorted(
+        [*edits.items(), *undos.items()], key=lambda item: item[1][0]
+    ):
+        controls.setdefault(target_id, []).append(msg)
+    return visible, controls, pin, cached_files
+
+
 def main() -> int:
     setup_logging()
     app = QApplication(sys.argv)
     app.setQuitOnLastWindowClosed(False)
+    QPixmapCache.setCacheLimit(20 * 1024)
     set_language("de-DE")
 
     splash = _create_splash(app)
     if splash:
         splash.show()
-        splash.showMessage(
-            t("splash.init_systems"),
-            alignment=Qt.AlignBottom | Qt.AlignHCenter,
-            color=QColor("#00ff66"),
-        )
+        splash.showMessage(t("splash.init_systems"), alignment=SPLASH_ALIGN, color=SPLASH_COLOR)
         app.processEvents()
 
     store = ConfigStore()
     store.load()
+
+    history = HistoryStore(history_path())
+    history_result: list[tuple] = []
+    history_thread = threading.Thread(
+        target=lambda sender_id: history_result.append(_fold_history(history.iter_stream(), sender_id)),
+        args=(store.config.sender_id,),
+        name="history-load",
+        daemon=True,
+    )
+    history_thread.start()
+
     set_language(store.config.language or "de-DE")
     apply_theme(app, store.config.theme)
 
@@ -115,11 +329,7 @@ def main() -> int:
     settings = QSettings("WalkuerTechnology", "LanChat")
 
     if splash:
-        splash.showMessage(
-            t("splash.load_ui"),
-            alignment=Qt.AlignBottom | Qt.AlignHCenter,
-            color=QColor("#00ff66"),
-        )
+        splash.showMessage(t("splash.load_ui"), alignment=SPLASH_ALIGN, color=SPLASH_COLOR)
         app.processEvents()
 
     window = MainWindow(store)
@@ -129,18 +339,21 @@ def main() -> int:
         if value is None:
             return None
         try:
-            if isinstance(value, (list, tuple)) and len(value) >= 4:
-                x, y, w, h = (int(value[0]), int(value[1]), int(value[2]), int(value[3]))
-                if w > 0 and h > 0:
-                    return QRect(x, y, w, h)
             if isinstance(value, str):
-                parts = [p for p in value.replace(";", ",").split(",") if p.strip()]
-                if len(parts) >= 4:
-                    x, y, w, h = (int(parts[0]), int(parts[1]), int(parts[2]), int(parts[3]))
-                    if w > 0 and h > 0:
-                        return QRect(x, y, w, h)
+                parts = value.split(",")
+                if len(parts) != 4:
+                    parts = [p for p in value.replace(";", ",").split(",") if p.strip()]
+            elif isinstance(value, (list, tuple)):
+                parts = list(value)
+            else:
+                return None
+            if len(parts) < 4:
+                return None
+            x, y, w, h = (int(p) for p in parts[:4])
         except Exception:
             return None
+        if w > 0 and h > 0:
+            return QRect(x, y, w, h)
         return None
 
     def _default_rect() -> QRect:
@@ -155,71 +368,62 @@ def main() -> int:
         return QRect(x, y, width, height)
 
     rect = _parse_rect(settings.value("window_rect")) if settings.contains("window_rect") else None
+    last_saved_rect = rect
     if rect is None:
         rect = _default_rect()
     window.setGeometry(rect)
 
     if splash:
-        splash.showMessage(
-            t("splash.init_network"),
-            alignment=Qt.AlignBottom | Qt.AlignHCenter,
-            color=QColor("#00ff66"),
-        )
+        splash.showMessage(t("splash.init_network"), alignment=SPLASH_ALIGN, color=SPLASH_COLOR)
         app.processEvents()
 
     network = LanChatNetwork(store)
     if splash:
-        splash.showMessage(
-            t("splash.load_history"),
-            alignment=Qt.AlignBottom | Qt.AlignHCenter,
-            color=QColor("#00ff66"),
-        )
+        splash.showMessage(t("splash.load_history"), alignment=SPLASH_ALIGN, color=SPLASH_COLOR)
         app.processEvents()
-    history = HistoryStore(history_path())
-    loaded_messages = history.load()
-
-    for msg in loaded_messages:
-        history_msg = dict(msg)
-        history_msg["_from_history"] = True
-        if history_msg.get("t") == "CHAT" and history_msg.get("subtype"):
-            subtype = history_msg.get("subtype")
-            if subtype == "REACT":
-                window.apply_reaction(
-                    history_msg.get("target_id", ""),
-                    history_msg.get("emoji", ""),
-                    history_msg.get("sender_id", ""),
-                )
-            elif subtype == "EDIT":
-                window.apply_edit(history_msg.get("target_id", ""), history_msg.get("text", ""))
-            elif subtype == "UNDO":
-                window.apply_undo(history_msg.get("target_id", ""))
-            elif subtype == "PIN":
-                window.apply_pin(
-                    history_msg.get("target_id", ""),
-                    history_msg.get("preview", ""),
-                    history_msg.get("name", ""),
-                )
-            elif subtype == "UNPIN":
-                window.apply_unpin(history_msg.get("target_id", ""))
-            continue
-        window.add_message(
-            history_msg,
-            history_msg.get("sender_ip", ""),
-            history_msg.get("sender_id") == store.config.sender_id,
-        )
-
-    from util.paths import attachment_cache_path
-
-    for msg in loaded_messages:
-        if msg.get("t") == "FILE" and msg.get("sender_id") == store.config.sender_id:
-            file_id = msg.get("file_id")
-            filename = msg.get("filename") or ""
-            if file_id and filename:
-                cache_path = attachment_cache_path(file_id, filename)
-                if cache_path.exists():
-                    network.register_cached_file(file_id, str(cache_path))
+    history_thread.join()
+    visible_messages, history_controls, history_pin, cached_files = (
+        history_result[0] if history_result else ([], {}, None, [])
+    )
+    older_messages = visible_messages[:-HISTORY_PAGE_SIZE]
+    tail_messages = visible_messages[-HISTORY_PAGE_SIZE:]
+    older_ids = {msg.get("message_id") for msg in older_messages if msg.get("message_id")}
+
+    def replay_history_controls(messages: list[dict]) -> None:
+        for message in messages:
+            for msg in history_controls.get(message.get("message_id") or "", ()):
+                _SUBTYPE_DISPATCH[msg["subtype"]](window, msg)
+
+    def load_older_history() -> None:
+        page = older_messages[-HISTORY_PAGE_SIZE:]
+        del older_messages[-HISTORY_PAGE_SIZE:]
+        older_ids.difference_update(msg.get("message_id") for msg in page)
+        window.set_has_older_history(bool(older_messages))
+        window.prepend_messages_bulk(page, store.config.sender_id, from_history=True)
+        replay_history_controls(page)
+
+    window.add_messages_bulk(tail_messages, store.config.sender_id, from_history=True)
+    if history_pin is not None:
+        _SUBTYPE_DISPATCH[history_pin["subtype"]](window, history_pin)
+    replay_history_controls(tail_messages)
+    window.set_has_older_history(bool(older_messages))
+    window.request_older_history.connect(load_older_history)
+
+    def defer_control(msg: dict) -> bool:
+        target_id = msg.get("target_id") or ""
+        if target_id not in older_ids:
+            return False
+        history_controls.setdefault(target_id, []).append(msg)
+        return True
+
+    def register_cached_files() -> None:
+        for file_id, filename in cached_files:
+            cache_path = attachment_cache_path(file_id, filename)
+            if cache_path.exists():
+                network.register_cached_file(file_id, str(cache_path))
 
     def save_geometry() -> None:
+        nonlocal last_saved_rect
         rect = window.geometry()
         if window.windowState() & Qt.WindowMaximized:
             normal = window.normalGeometry()
@@ -227,43 +431,18 @@ def main() -> int:
                 rect = normal
         if not rect.isValid() or rect.width() <= 0 or rect.height() <= 0:
             return
+        if rect == last_saved_rect:
+            return
         settings.setValue(
             "window_rect",
             f"{rect.x()},{rect.y()},{rect.width()},{rect.height()}",
         )
+        last_saved_rect = QRect(rect)
         if settings.contains("geometry"):
             settings.remove("geometry")
 
     tray = None
-    api_lock = threading.Lock()
-    api_state = {"peers": [], "pinned": None}
-
-    def update_api_peers(peers: list[dict]) -> None:
-        with api_lock:
-            api_state["peers"] = list(peers)
-
-    def get_api_peers() -> list[dict]:
-        with api_lock:
-            return list(api_state["peers"])
-
-    def update_api_pinned(pinned: dict | None) -> None:
-        with api_lock:
-            api_state["pinned"] = dict(pinned) if pinned else None
-
-    def get_api_pinned() -> dict | None:
-        with api_lock:
-            pinned = api_state["pinned"]
-            return dict(pinned) if pinned else None
-
-    def get_api_history() -> list[dict]:
-        return list(history.items)
-
-    def get_api_self() -> dict:
-        return {
-            "sender_id": store.config.sender_id,
-            "name": store.config.user_name,
-            "avatar_sha256": store.config.avatar_sha256,
-        }
+    api_state = _ApiState(history, store)
 
     def notify_if_needed(msg: dict) -> None:
         if not window.should_notify():
@@ -277,36 +456,17 @@ def main() -> int:
             tray.show_message(name, body)
         play_notification(store.config.sound_enabled)
 
-    def _api_sender_name(name: str) -> str:
-        base_name = (name or "").strip() or t("user.unknown")
-        suffix = " (API)"
-        if base_name.endswith(suffix):
-            return base_name
-        return f"{base_name}{suffix}"
-
     def handle_incoming(msg: dict, sender_ip: str) -> None:
         msg = dict(msg)
         msg["sender_ip"] = sender_ip
         if msg.get("t") == "CHAT" and msg.get("subtype"):
             subtype = msg.get("subtype")
-            if subtype == "REACT":
-                window.apply_reaction(msg.get("target_id", ""), msg.get("emoji", ""), msg.get("sender_id", ""))
-                return
-            if subtype == "EDIT":
-                window.apply_edit(msg.get("target_id", ""), msg.get("text", ""))
-                history.append(msg)
-                return
-            if subtype == "UNDO":
-                window.apply_undo(msg.get("target_id", ""))
-                history.append(msg)
-                return
-            if subtype == "PIN":
-                window.apply_pin(msg.get("target_id", ""), msg.get("preview", ""), msg.get("name", ""))
-                history.append(msg)
-                return
-            if subtype == "UNPIN":
-                window.apply_unpin(msg.get("target_id", ""))
-                history.append(msg)
+            apply_control = _SUBTYPE_DISPATCH.get(subtype)
+            if apply_control is not None:
+                if subtype in ("PIN", "UNPIN") or not defer_control(msg):
+                    apply_control(window, msg)
+                if subtype != "REACT":
+                    history.append(msg)
                 return
         window.add_message(msg, sender_ip, False)
         history.append(msg)
@@ -324,8 +484,6 @@ def main() -> int:
             thumb_path = link_preview.pop("thumb_path", "") or ""
             thumb_file_id = link_preview.get("thumb_file_id") or ""
             if thumb_path and not thumb_file_id:
-                import hashlib
-
                 url_seed = link_preview.get("url") or ""
                 digest = hashlib.sha1(url_seed.encode("utf-8")).hexdigest()
                 thumb_file_id = f"lp_{digest[:12]}"
@@ -339,7 +497,7 @@ def main() -> int:
         else:
             msg = network.send_chat(text)
         window.add_message(msg, "", True)
-        history.append(dict(msg))
+        history.append(msg)
         if via_api:
             notify_if_needed(msg)
 
@@ -347,56 +505,65 @@ def main() -> int:
         if not target_id:
             return
         msg = network.send_edit(target_id, text)
-        history.append(dict(msg))
+        defer_control(msg)
+        history.append(msg)
 
     def handle_undo_message(target_id: str) -> None:
         if not target_id:
             return
         msg = network.send_undo(target_id)
-        history.append(dict(msg))
+        defer_control(msg)
+        history.append(msg)
 
     def handle_pin_message(target_id: str, preview: str) -> None:
         if not target_id:
             return
         msg = network.send_pin(target_id, preview)
-        history.append(dict(msg))
+        history.append(msg)
 
     def handle_unpin_message(target_id: str) -> None:
         if not target_id:
             return
         msg = network.send_unpin(target_id)
-        history.append(dict(msg))
+        history.append(msg)
 
     def handle_send_files(paths: list[str]) -> None:
         for path in paths:
             try:
-                from util.filehash import sha256_file
-                import os
-                import shutil
-                import uuid
-                from util.paths import attachment_cache_path
-
-                file_id = str(uuid.uuid4())
-                size = os.path.getsize(path)
-                sha = sha256_file(path)
+                stat = os.stat(path)
+                size = stat.st_size
                 filename = os.path.basename(path)
-                cache_path = attachment_cache_path(file_id, filename)
+                seed = os.fsencode(os.path.abspath(path)) + f"|{size}|{stat.st_mtime_ns}".encode("ascii")
+                file_id = protocol.new_message_id()
+                content_path = attachment_cache_path(f"src_{hashlib.sha256(seed).hexdigest()[:32]}", filename)
+                sha_path = content_path.with_name(content_path.name + ".sha256")
+                sha = ""
                 try:
-                    if not cache_path.exists():
-                        cache_path.parent.mkdir(parents=True, exist_ok=True)
-                        shutil.copy2(path, cache_path)
-                    send_path = str(cache_path)
+                    if content_path.exists() and sha_path.exists():
+                        sha = sha_path.read_text(encoding="utf-8").strip()
+                    if not sha:
+                        content_path.parent.mkdir(parents=True, exist_ok=True)
+                        sha = copy_file_sha256(path, content_path)
+                        sha_path.write_text(sha, encoding="utf-8")
+                    cache_path = attachment_cache_path(file_id, filename)
+                    try:
+                        os.link(content_path, cache_path)
+                        send_path = str(cache_path)
+                    except OSError:
+                        send_path = str(content_path)
                 except Exception:
                     send_path = path
+                if not sha:
+                    sha = sha256_file(path)
                 msg = network.send_file(file_id, send_path, filename, size, sha)
                 window.add_message(msg, "", True)
-                history.append(dict(msg))
+                history.append(msg)
             except Exception:
                 window.show_status(t("status.send_file_failed"))
 
     def show_settings(force: bool = False) -> None:
-        dlg = SettingsDialog(store, api_url=_api_url(), force=force, parent=window)
-        dlg.saved.connect(lambda: network.send_hello())
+        dlg = _get_settings_cls()(store, api_url=_api_url(), force=force, parent=window)
+        dlg.saved.connect(network.send_hello)
         dlg.saved.connect(lambda: apply_theme(app, store.config.theme))
         dlg.saved.connect(apply_api_settings)
         dlg.saved.connect(window.apply_translations)
@@ -404,13 +571,20 @@ def main() -> int:
         dlg.exec()
 
     def show_about() -> None:
-        dlg = AboutDialog(window)
-        dlg.exec()
+        _get_show_about()(window)
+
+    language_dialog = None
 
     def show_language_picker() -> None:
-        dlg = LanguageDialog(store, parent=window)
-        dlg.saved.connect(window.apply_translations)
-        dlg.saved.connect(lambda: tray.apply_translations() if tray is not None else None)
+        nonlocal language_dialog
+        dlg = language_dialog
+        if dlg is None:
+            dlg = _get_language_cls()(store, parent=window)
+            dlg.language_changed.connect(_api_sender_name.cache_clear)
+            dlg.language_changed.connect(lambda: tray.apply_translations() if tray is not None else None)
+            language_dialog = dlg
+        else:
+            dlg.sync()
         dlg.exec()
 
     def quit_app() -> None:
@@ -420,7 +594,7 @@ def main() -> int:
         window.allow_close()
         app.quit()
 
-    api_service = ApiService(
+    api_service = _get_api_service_cls()(
         token=store.config.api_token,
         enabled=store.config.api_enabled,
         send_text=window.send_text.emit,
@@ -429,17 +603,18 @@ def main() -> int:
         send_undo=window.undo_message.emit,
         send_pin=window.pin_message.emit,
         send_unpin=window.unpin_message.emit,
-        get_peers=get_api_peers,
-        get_history=get_api_history,
-        get_pinned=get_api_pinned,
+        get_peers=api_state.get_peers,
+        get_history=api_state.get_history,
+        get_message=api_state.get_message,
+        get_pinned=api_state.get_pinned,
         get_queue_size=network.queue_size,
-        get_self_info=get_api_self,
+        get_self_info=api_state.get_self,
     )
 
     network.set_api_service(api_service)
     network.ensure_api(store.config.api_enabled)
-    update_api_peers(network.peers_snapshot())
-    update_api_pinned(window.get_pinned_message())
+    api_state.update_peers(network.peers_snapshot())
+    api_state.update_pinned(window.get_pinned_message())
 
     def _api_url() -> str:
         port = network.api_port()
@@ -448,6 +623,7 @@ def main() -> int:
         return f"http://127.0.0.1:{port}/api/v1/"
 
     def apply_api_settings() -> None:
+        _api_sender_name.cache_clear()
         api_service.set_token(store.config.api_token)
         api_service.set_enabled(store.config.api_enabled)
         network.set_api_enabled(store.config.api_enabled)
@@ -455,12 +631,12 @@ def main() -> int:
 
     window.send_text.connect(handle_send_text)
     window.send_files.connect(handle_send_files)
-    window.reaction_send.connect(lambda target_id, emoji: network.send_reaction(target_id, emoji))
+    window.reaction_send.connect(network.send_reaction)
     window.edit_message.connect(handle_edit_message)
     window.undo_message.connect(handle_undo_message)
     window.pin_message.connect(handle_pin_message)
     window.unpin_message.connect(handle_unpin_message)
-    window.pinned_changed.connect(update_api_pinned)
+    window.pinned_changed.connect(api_state.update_pinned)
     window.typing_changed.connect(network.set_typing)
     window.open_settings.connect(lambda: show_settings(False))
     window.open_about.connect(show_about)
@@ -468,8 +644,12 @@ def main() -> int:
     network.chat_received.connect(handle_incoming)
     network.file_received.connect(handle_incoming)
     network.online_count.connect(window.set_online_count)
-    network.peers_updated.connect(window.set_peers)
-    network.peers_updated.connect(update_api_peers)
+    def apply_peers(peers: list[dict]) -> None:
+        api_state.update_peers(peers)
+        window.set_peers(peers)
+
+    peers_debouncer = _Debouncer(apply_peers, 80, window)
+    network.peers_updated.connect(peers_debouncer.schedule)
     network.avatar_updated.connect(window.refresh_avatar)
 
     window.set_peers(network.peers_snapshot())
@@ -479,6 +659,15 @@ def main() -> int:
     if splash:
         app.processEvents()
 
+        def finish_splash() -> None:
+            splash.finish(window)
+            splash.deleteLater()
+            window.show()
+            window.activateWindow()
+            QTimer.singleShot(0, register_cached_files)
+            if not store.config.first_run_complete:
+                QTimer.singleShot(0, show_language_picker)
+
         def start_splash_fade() -> None:
             effect = QGraphicsOpacityEffect(splash)
             splash.setGraphicsEffect(effect)
@@ -486,22 +675,17 @@ def main() -> int:
             anim.setDuration(180)
             anim.setStartValue(1.0)
             anim.setEndValue(0.0)
-
-            def _finish() -> None:
-                splash.finish(window)
-                splash.deleteLater()
-                window.show()
-                window.activateWindow()
-                if not store.config.first_run_complete:
-                    QTimer.singleShot(0, show_language_picker)
-
-            anim.finished.connect(_finish)
+            anim.finished.connect(finish_splash)
             anim.start(QAbstractAnimation.DeleteWhenStopped)
             splash._fade_anim = anim  # keep alive
 
-        QTimer.singleShot(0, start_splash_fade)
+        if not store.config.first_run_complete or store.config.disable_animations:
+            QTimer.singleShot(0, finish_splash)
+        else:
+            QTimer.singleShot(0, start_splash_fade)
     else:
         window.show()
+        QTimer.singleShot(0, register_cached_files)
         if not store.config.first_run_complete:
             QTimer.singleShot(0, show_language_picker)
 
@@ -512,4 +696,4 @@ def main() -> int:
 
 
 if __name__ == "__main__":
-    raise SystemExit(main())
+    raise SystemExit(main())
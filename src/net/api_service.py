@@ -1,12 +1,42 @@
 from __future__ import annotations
 
-import json
-import uuid
+import hmac
+import re
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Callable
-from urllib.parse import parse_qs
+from typing import Any, Callable, Mapping
+from urllib.parse import unquote_plus
 
 from net import protocol
+from util.fastjson import dumps, loads
+
+_WS_RE = re.compile(r"\s+")
+
+
+def _get_qparam(query: str, key: str) -> str:
+    if not query:
+        return ""
+    for part in query.split("&"):
+        name, _sep, value = part.partition("=")
+        if name == key and value:
+            if "%" in value or "+" in value:
+                return unquote_plus(value)
+            return value
+    return ""
+
+
+def _utf8_len_le(text: str, limit: int) -> bool:
+    length = len(text)
+    if length <= limit // 4:
+        return True
+    if length > limit:
+        return False
+    return len(text.encode("utf-8")) <= limit
+
+
+@lru_cache(maxsize=64)
+def _error_response(status: int, error: str) -> tuple[int, bytes, str]:
+    return status, dumps({"ok": False, "error": error}), "application/json; charset=utf-8"
 
 
 class ApiService:
@@ -21,12 +51,14 @@ class ApiService:
         send_pin: Callable[[str, str], None],
         send_unpin: Callable[[str], None],
         get_peers: Callable[[], list[dict[str, Any]]],
-        get_history: Callable[[], list[dict[str, Any]]],
+        get_history: Callable[[int | None, str | None], list[dict[str, Any]]],
+        get_message: Callable[[str], dict[str, Any] | None],
         get_pinned: Callable[[], dict[str, Any] | None],
         get_queue_size: Callable[[], int],
         get_self_info: Callable[[], dict[str, Any]],
     ) -> None:
         self._token = token
+        self._token_b = token.encode("utf-8")
         self._enabled = enabled
         self._send_text = send_text
         self._send_files = send_files
@@ -36,15 +68,31 @@ class ApiService:
         self._send_unpin = send_unpin
         self._get_peers = get_peers
         self._get_history = get_history
+        self._get_message = get_message
         self._get_pinned = get_pinned
         self._get_queue_size = get_queue_size
         self._get_self_info = get_self_info
+        self._describe_cache: dict[int, tuple[int, bytes, str]] = {}
+        self._help_cache: dict[int, tuple[int, bytes, str]] = {}
+        self._routes: dict[tuple[str, str], Callable[[str, bytes, int], tuple[int, bytes, str]]] = {
+            ("GET", "/api/v1/status"): self._route_status,
+            ("GET", "/api/v1/peers"): self._route_peers,
+            ("GET", "/api/v1/messages"): self._route_messages,
+            ("GET", "/api/v1/pin"): self._route_pinned,
+            ("POST", "/api/v1/send"): self._json_route(self._handle_send),
+            ("POST", "/api/v1/send/file"): self._json_route(self._handle_send_file),
+            ("POST", "/api/v1/edit"): self._json_route(self._handle_edit),
+            ("POST", "/api/v1/undo"): self._json_route(self._handle_undo),
+            ("POST", "/api/v1/pin"): self._json_route(self._handle_pin),
+            ("POST", "/api/v1/unpin"): self._json_route(self._handle_unpin),
+        }
 
     def set_enabled(self, enabled: bool) -> None:
         self._enabled = enabled
 
     def set_token(self, token: str) -> None:
         self._token = token
+        self._token_b = token.encode("utf-8")
 
     def handle(
         self,
@@ -52,60 +100,40 @@ class ApiService:
         path: str,
         query: str,
         body: bytes,
-        headers: dict[str, str],
+        headers: Mapping[str, str],
         server_port: int,
     ) -> tuple[int, bytes, str]:
         clean_path = path.rstrip("/") or "/"
         if method == "GET" and clean_path in {"/api/v1", "/api/v1/"}:
-            payload = self.describe(server_port)
-            return self._json_response(200, payload)
+            response = self._describe_cache.get(server_port)
+            if response is None:
+                response = self._json_response(200, self.describe(server_port))
+                self._describe_cache[server_port] = response
+            return response
         if method == "GET" and clean_path == "/api/v1/help":
-            return 200, self._help_text(server_port).encode("utf-8"), "text/plain; charset=utf-8"
+            response = self._help_cache.get(server_port)
+            if response is None:
+                response = (200, self._help_text(server_port).encode("utf-8"), "text/plain; charset=utf-8")
+                self._help_cache[server_port] = response
+            return response
 
         if not self._enabled:
-            return self._json_response(404, {"ok": False, "error": "API disabled"})
+            return _error_response(404, "API disabled")
 
         if not self._authorized(headers, query):
-            return self._json_response(401, {"ok": False, "error": "Unauthorized"})
-
-        if clean_path == "/api/v1/status" and method == "GET":
-            return self._json_response(200, self._status_payload(server_port))
-        if clean_path == "/api/v1/peers" and method == "GET":
-            return self._json_response(200, {"ok": True, "peers": self._get_peers()})
-        if clean_path == "/api/v1/messages" and method == "GET":
-            limit = self._parse_limit(query)
-            history = self._get_history()
-            return self._json_response(
-                200,
-                {"ok": True, "messages": history[-limit:] if limit else history},
-            )
-        if clean_path == "/api/v1/pin" and method == "GET":
-            pinned = self._get_pinned()
-            if not pinned:
-                return self._json_response(200, {"ok": True, "pinned": None})
-            return self._json_response(200, {"ok": True, "pinned": pinned})
+            return _error_response(401, "Unauthorized")
+
+        route = self._routes.get((method, clean_path))
+        if route is not None:
+            return route(query, body, server_port)
 
         if method != "POST":
-            return self._json_response(405, {"ok": False, "error": "Method not allowed"})
+            return _error_response(405, "Method not allowed")
 
-        payload, error = self._parse_json(body)
+        _payload, error = self._parse_json(body)
         if error:
-            return self._json_response(400, {"ok": False, "error": error})
-
-        if clean_path == "/api/v1/send":
-            return self._handle_send(payload)
-        if clean_path == "/api/v1/send/file":
-            return self._handle_send_file(payload)
-        if clean_path == "/api/v1/edit":
-            return self._handle_edit(payload)
-        if clean_path == "/api/v1/undo":
-            return self._handle_undo(payload)
-        if clean_path == "/api/v1/pin":
-            return self._handle_pin(payload)
-        if clean_path == "/api/v1/unpin":
-            return self._handle_unpin(payload)
-
-        return self._json_response(404, {"ok": False, "error": "Not found"})
+            return _error_response(400, error)
+        return _error_response(404, "Not found")
 
     def describe(self, server_port: int) -> dict[str, Any]:
         base_url = f"http://127.0.0.1:{server_port}/api/v1"
@@ -133,7 +161,11 @@ class ApiService:
                 {"method": "GET", "path": "/api/v1/help", "description": "Plain text help."},
                 {"method": "GET", "path": "/api/v1/status", "description": "API and network status."},
                 {"method": "GET", "path": "/api/v1/peers", "description": "List online peers."},
-                {"method": "GET", "path": "/api/v1/messages?limit=50", "description": "Recent messages."},
+                {
+                    "method": "GET",
+                    "path": "/api/v1/messages?limit=50",
+                    "description": "Recent messages. Optional before=<message_id> pages to older messages.",
+                },
                 {"method": "GET", "path": "/api/v1/pin", "description": "Get pinned message."},
                 {
                     "method": "POST",
@@ -182,13 +214,38 @@ class ApiService:
             "self": info,
         }
 
+    def _route_status(self, query: str, body: bytes, server_port: int) -> tuple[int, bytes, str]:
+        return self._json_response(200, self._status_payload(server_port))
+
+    def _route_peers(self, query: str, body: bytes, server_port: int) -> tuple[int, bytes, str]:
+        return self._json_response(200, {"ok": True, "peers": self._get_peers()})
+
+    def _route_messages(self, query: str, body: bytes, server_port: int) -> tuple[int, bytes, str]:
+        limit = self._parse_limit(query)
+        before = _get_qparam(query, "before").strip() or None
+        return self._json_response(200, {"ok": True, "messages": self._get_history(limit, before)})
+
+    def _route_pinned(self, query: str, body: bytes, server_port: int) -> tuple[int, bytes, str]:
+        return self._json_response(200, {"ok": True, "pinned": self._get_pinned() or None})
+
+    def _json_route(
+        self, handler: Callable[[dict[str, Any]], tuple[int, bytes, str]]
+    ) -> Callable[[str, bytes, int], tuple[int, bytes, str]]:
+        def route(query: str, body: bytes, server_port: int) -> tuple[int, bytes, str]:
+            payload, error = self._parse_json(body)
+            if error:
+                return _error_response(400, error)
+            return handler(payload)
+
+        return route
+
     def _handle_send(self, payload: dict[str, Any]) -> tuple[int, bytes, str]:
         text = (payload.get("text") or "").strip()
         if not text:
-            return self._json_response(400, {"ok": False, "error": "Missing text"})
-        if len(text.encode("utf-8")) > protocol.MAX_TEXT_BYTES:
-            return self._json_response(400, {"ok": False, "error": "Text too long (max 8 KB)"})
-        message_id = payload.get("message_id") or str(uuid.uuid4())
+            return _error_response(400, "Missing text")
+        if not _utf8_len_le(text, protocol.MAX_TEXT_BYTES):
+            return _error_response(400, "Text too long (max 8 KB)")
+        message_id = payload.get("message_id") or protocol.new_message_id()
         send_payload = dict(payload)
         send_payload["text"] = text
         send_payload["message_id"] = message_id
@@ -199,9 +256,9 @@ class ApiService:
     def _handle_send_file(self, payload: dict[str, Any]) -> tuple[int, bytes, str]:
         path = (payload.get("path") or "").strip()
         if not path:
-            return self._json_response(400, {"ok": False, "error": "Missing path"})
+            return _error_response(400, "Missing path")
         if not Path(path).exists():
-            return self._json_response(404, {"ok": False, "error": "File not found"})
+            return _error_response(404, "File not found")
         self._send_files([path])
         return self._json_response(200, {"ok": True, "queued": True})
 
@@ -209,23 +266,23 @@ class ApiService:
         message_id = (payload.get("message_id") or "").strip()
         text = (payload.get("text") or "").strip()
         if not message_id or not text:
-            return self._json_response(400, {"ok": False, "error": "Missing message_id or text"})
-        if len(text.encode("utf-8")) > protocol.MAX_TEXT_BYTES:
-            return self._json_response(400, {"ok": False, "error": "Text too long (max 8 KB)"})
+            return _error_response(400, "Missing message_id or text")
+        if not _utf8_len_le(text, protocol.MAX_TEXT_BYTES):
+            return _error_response(400, "Text too long (max 8 KB)")
         self._send_edit(message_id, text)
         return self._json_response(200, {"ok": True})
 
     def _handle_undo(self, payload: dict[str, Any]) -> tuple[int, bytes, str]:
         message_id = (payload.get("message_id") or "").strip()
         if not message_id:
-            return self._json_response(400, {"ok": False, "error": "Missing message_id"})
+            return _error_response(400, "Missing message_id")
         self._send_undo(message_id)
         return self._json_response(200, {"ok": True})
 
     def _handle_pin(self, payload: dict[str, Any]) -> tuple[int, bytes, str]:
         message_id = (payload.get("message_id") or "").strip()
         if not message_id:
-            return self._json_response(400, {"ok": False, "error": "Missing message_id"})
+            return _error_response(400, "Missing message_id")
         preview = (payload.get("preview") or "").strip()
         if not preview:
             preview = self._preview_from_history(message_id)
@@ -235,22 +292,21 @@ class ApiService:
     def _handle_unpin(self, payload: dict[str, Any]) -> tuple[int, bytes, str]:
         message_id = (payload.get("message_id") or "").strip()
         if not message_id:
-            return self._json_response(400, {"ok": False, "error": "Missing message_id"})
+            return _error_response(400, "Missing message_id")
         self._send_unpin(message_id)
         return self._json_response(200, {"ok": True})
 
-    def _authorized(self, headers: dict[str, str], query: str) -> bool:
+    def _authorized(self, headers: Mapping[str, str], query: str) -> bool:
         token = headers.get("X-API-Token") or ""
         if not token:
-            params = parse_qs(query or "")
-            token = (params.get("token") or [""])[0]
-        return bool(token) and token == self._token
+            token = _get_qparam(query, "token")
+        return bool(token) and hmac.compare_digest(token.encode("utf-8"), self._token_b)
 
     def _parse_json(self, body: bytes) -> tuple[dict[str, Any], str | None]:
         if not body:
             return {}, None
         try:
-            payload = json.loads(body.decode("utf-8"))
+            payload = loads(body)
             if not isinstance(payload, dict):
                 return {}, "Invalid JSON payload"
             return payload, None
@@ -258,8 +314,7 @@ class ApiService:
             return {}, "Invalid JSON payload"
 
     def _parse_limit(self, query: str) -> int:
-        params = parse_qs(query or "")
-        raw = (params.get("limit") or [""])[0]
+        raw = _get_qparam(query, "limit")
         try:
             value = int(raw)
         except Exception:
@@ -267,19 +322,18 @@ class ApiService:
         return max(1, min(200, value))
 
     def _json_response(self, status: int, payload: dict[str, Any]) -> tuple[int, bytes, str]:
-        return status, json.dumps(payload, ensure_ascii=False).encode("utf-8"), "application/json; charset=utf-8"
+        return status, dumps(payload), "application/json; charset=utf-8"
 
     def _preview_from_history(self, message_id: str) -> str:
-        history = self._get_history()
-        for msg in reversed(history):
-            if msg.get("message_id") == message_id:
-                text = msg.get("text") or msg.get("filename") or ""
-                return self._trim_text(text)
-        return ""
+        msg = self._get_message(message_id)
+        if not msg:
+            return ""
+        text = msg.get("text") or msg.get("filename") or ""
+        return self._trim_text(text)
 
     @staticmethod
     def _trim_text(text: str, max_len: int = 120) -> str:
-        cleaned = " ".join((text or "").split())
+        cleaned = _WS_RE.sub(" ", text or "").strip()
         if len(cleaned) <= max_len:
             return cleaned
         return cleaned[: max_len - 1] + "."
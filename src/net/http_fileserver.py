@@ -1,13 +1,25 @@
 from __future__ import annotations
 
 import mimetypes
+import re
 import threading
 import urllib.parse
+from functools import lru_cache
 from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
-from net.api_service import ApiService
+from util.workers import DaemonPool
+
+if TYPE_CHECKING:
+    from net.api_service import ApiService
+
+_ROUTE_RE = re.compile(r"^/(api|f|avatar)/(.*)$")
+
+
+@lru_cache(maxsize=256)
+def _mime_for(ext: str) -> str:
+    return mimetypes.guess_type("x" + ext)[0] or "application/octet-stream"
 
 
 class FileRegistry:
@@ -37,40 +49,39 @@ class FileRegistry:
 
 class _Handler(BaseHTTPRequestHandler):
     server: "FileHttpServer"
+    disable_nagle_algorithm = True
+    wbufsize = -1
 
     def do_GET(self) -> None:  # noqa: N802 - required by BaseHTTPRequestHandler
         parsed = urllib.parse.urlparse(self.path)
-        if parsed.path.startswith("/api/"):
+        match = _ROUTE_RE.match(parsed.path)
+        if not match:
+            self.send_error(404)
+            return
+        bucket = match.group(1)
+        if bucket == "api":
             self._handle_api("GET", parsed)
             return
-        if parsed.path.startswith("/f/"):
-            file_id = parsed.path.replace("/f/", "", 1).strip("/")
-            path = self.server.registry.get(file_id)
+        key = match.group(2).strip("/")
+        if bucket == "f":
+            path = self.server.registry.get(key)
             download_name = path.name if path else "download.bin"
-        elif parsed.path.startswith("/avatar/"):
-            sha256 = parsed.path.replace("/avatar/", "", 1).strip("/")
-            path = self.server.registry.get_avatar(sha256)
-            download_name = f"avatar_{sha256}.png"
         else:
-            self.send_error(404)
-            return
+            path = self.server.registry.get_avatar(key)
+            download_name = f"avatar_{key}.png"
         if not path or not path.exists():
             self.send_error(404)
             return
         try:
             size = path.stat().st_size
-            mime, _ = mimetypes.guess_type(str(path))
             self.send_response(200)
-            self.send_header("Content-Type", mime or "application/octet-stream")
+            self.send_header("Content-Type", _mime_for(path.suffix.lower()))
             self.send_header("Content-Length", str(size))
             self.send_header("Content-Disposition", f'attachment; filename="{download_name}"')
             self.end_headers()
+            self.wfile.flush()
             with open(path, "rb") as f:
-                while True:
-                    chunk = f.read(1024 * 256)
-                    if not chunk:
-                        break
-                    self.wfile.write(chunk)
+                self.connection.sendfile(f)
         except Exception:
             try:
                 self.send_error(500)
@@ -110,7 +121,7 @@ class _Handler(BaseHTTPRequestHandler):
             parsed.path,
             parsed.query,
             body,
-            {k: v for k, v in self.headers.items()},
+            self.headers,
             self.server.server_address[1],
         )
         self.send_response(status)
@@ -126,6 +137,7 @@ class _Handler(BaseHTTPRequestHandler):
 
 class FileHttpServer(ThreadingHTTPServer):
     daemon_threads = True
+    max_workers = 16
 
     def __init__(
         self,
@@ -134,11 +146,20 @@ class FileHttpServer(ThreadingHTTPServer):
         api_service: ApiService | None,
         api_enabled: bool,
     ) -> None:
+        self._pool = DaemonPool(self.max_workers, name="http")
         super().__init__(server_address, _Handler)
         self.registry = registry
         self.api_service = api_service
         self.api_enabled = api_enabled
 
+    def process_request(self, request, client_address) -> None:
+        if not self._pool.submit(self.process_request_thread, request, client_address):
+            self.shutdown_request(request)
+
+    def server_close(self) -> None:
+        super().server_close()
+        self._pool.close()
+
 
 class FileServer:
     def __init__(self, port_range: tuple[int, int] = (51338, 51388)) -> None:
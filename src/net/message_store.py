@@ -1,10 +1,18 @@
 from __future__ import annotations
 
-import json
+import atexit
+import logging
+import os
+import threading
 import time
-from collections import OrderedDict
+from collections import OrderedDict, deque
+from itertools import islice
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
+
+from util.fastjson import dumps_line, loads
+
+_log = logging.getLogger(__name__)
 
 
 class DedupCache:
@@ -24,47 +32,201 @@ class DedupCache:
         return False
 
     def _prune(self, now: float) -> None:
-        expired = [k for k, v in self._items.items() if now - v > self._ttl]
-        for key in expired:
-            self._items.pop(key, None)
+        items = self._items
+        while items:
+            if now - next(iter(items.values())) <= self._ttl:
+                break
+            items.popitem(last=False)
 
 
 class HistoryStore:
-    def __init__(self, path: Path, max_items: int = 500) -> None:
+    def __init__(
+        self,
+        path: Path,
+        max_items: int = 500,
+        flush_interval: float = 0.25,
+        flush_threshold: int = 32,
+    ) -> None:
         self.path = path
         self.max_items = max_items
-        self.items: list[dict[str, Any]] = []
+        self.items: deque[dict[str, Any]] = deque(maxlen=max_items)
+        self._lines: deque[bytes] = deque(maxlen=max_items)
+        self._by_id: dict[str, dict[str, Any]] = {}
+        self._pending: list[bytes] = []
+        self._disk_lines = 0
+        self._fh = None
+        self._flush_interval = flush_interval
+        self._flush_threshold = flush_threshold
+        self._flush_timer: threading.Timer | None = None
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        except Exception:
+            pass
+        atexit.register(self.close)
 
     def load(self) -> list[dict[str, Any]]:
-        if not self.path.exists():
-            self.items = []
-            return self.items
-        items: list[dict[str, Any]] = []
+        for _msg in self.iter_stream():
+            pass
+        return list(self.items)
+
+    def iter_stream(self) -> Iterator[dict[str, Any]]:
+        items: deque[dict[str, Any]] = deque(maxlen=self.max_items)
+        lines: deque[bytes] = deque(maxlen=self.max_items)
+        by_id: dict[str, dict[str, Any]] = {}
+        disk_lines = 0
         try:
-            with open(self.path, "r", encoding="utf-8") as f:
+            with open(self.path, "rb") as f:
+                for line in f:
+                    if line.strip():
+                        disk_lines += 1
+                f.seek(0)
+                skip = disk_lines - self.max_items
                 for line in f:
                     line = line.strip()
                     if not line:
                         continue
+                    if skip > 0:
+                        skip -= 1
+                        continue
                     try:
-                        msg = json.loads(line)
-                        if isinstance(msg, dict):
-                            items.append(msg)
+                        msg = loads(line)
                     except Exception:
                         continue
-        except Exception:
-            items = []
-        self.items = items[-self.max_items :]
-        return self.items
+                    if isinstance(msg, dict):
+                        if len(items) == self.max_items:
+                            _drop_index(by_id, items[0])
+                        items.append(msg)
+                        _add_index(by_id, msg)
+                        lines.append(line + b"\n")
+                        yield msg
+        except OSError:
+            pass
+        finally:
+            with self._lock:
+                self.items = items
+                self._lines = lines
+                self._by_id = by_id
+                self._disk_lines = disk_lines
 
     def append(self, msg: dict[str, Any]) -> None:
-        self.items.append(msg)
-        if len(self.items) > self.max_items:
-            self.items = self.items[-self.max_items :]
-        self.path.parent.mkdir(parents=True, exist_ok=True)
+        line = dumps_line(msg)
+        with self._lock:
+            if len(self.items) == self.max_items:
+                _drop_index(self._by_id, self.items[0])
+            self.items.append(msg)
+            _add_index(self._by_id, msg)
+            self._lines.append(line)
+            self._pending.append(line)
+            pending = len(self._pending)
+            if self._flush_timer is None:
+                self._flush_timer = threading.Timer(self._flush_interval, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+        if pending >= self._flush_threshold:
+            self.flush()
+
+    def get(self, message_id: str) -> dict[str, Any] | None:
+        return self._by_id.get(message_id)
+
+    def tail(self, limit: int | None = None, before: str | None = None) -> list[dict[str, Any]]:
+        with self._lock:
+            if before and before not in self._by_id:
+                return []
+            items = reversed(self.items)
+            if before:
+                for msg in items:
+                    if msg.get("message_id") == before:
+                        break
+                else:
+                    return []
+            result = list(islice(items, limit))
+        result.reverse()
+        return result
+
+    def flush(self) -> None:
+        with self._io_lock:
+            with self._lock:
+                timer, self._flush_timer = self._flush_timer, None
+                if not self._pending:
+                    return
+                pending, self._pending = self._pending, []
+                compact = self._disk_lines + len(pending) > 2 * self.max_items
+                data = b"".join(self._lines) if compact else b"".join(pending)
+                disk_lines = self._disk_lines
+                self._disk_lines = len(self._lines) if compact else self._disk_lines + len(pending)
+            if timer is not None:
+                timer.cancel()
+            try:
+                if compact:
+                    self._compact(data)
+                else:
+                    if self._fh is None:
+                        self._fh = self._open_for_append()
+                    self._write_all(data)
+            except Exception as exc:
+                self._close_fh()
+                with self._lock:
+                    self._pending[:0] = pending
+                    self._disk_lines = disk_lines
+                    if self._flush_timer is None:
+                        self._flush_timer = threading.Timer(self._flush_interval, self.flush)
+                        self._flush_timer.daemon = True
+                        self._flush_timer.start()
+                _log.warning("history flush failed, %d lines requeued: %s", len(pending), exc)
+                return
+            try:
+                if not compact:
+                    os.fsync(self._fh.fileno())
+            except Exception:
+                pass
+
+    def close(self) -> None:
+        self.flush()
+        with self._io_lock:
+            self._close_fh()
+
+    def _compact(self, data: bytes) -> None:
+        self._close_fh()
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    def _write_all(self, data: bytes) -> None:
+        view = memoryview(data)
+        while view:
+            view = view[self._fh.write(view) :]
+
+    def _open_for_append(self):
+        fh = open(self.path, "ab", buffering=0)
+        if fh.tell():
+            with open(self.path, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    fh.write(b"\n")
+        return fh
+
+    def _close_fh(self) -> None:
+        if self._fh is None:
+            return
         try:
-            with open(self.path, "w", encoding="utf-8") as f:
-                for item in self.items:
-                    f.write(json.dumps(item, ensure_ascii=False) + "\n")
+            self._fh.close()
         except Exception:
-            pass
+            pass
+        self._fh = None
+
+
+def _add_index(index: dict[str, dict[str, Any]], msg: dict[str, Any]) -> None:
+    message_id = msg.get("message_id")
+    if message_id:
+        index[message_id] = msg
+
+
+def _drop_index(index: dict[str, dict[str, Any]], msg: dict[str, Any]) -> None:
+    message_id = msg.get("message_id")
+    if message_id and index.get(message_id) is msg:
+        del index[message_id]
@@ -171,6 +171,7 @@ class LanChatNetwork(QObject):
         self._dedup = DedupCache()
         self._http_port = 0
         self._typing = False
+        self._builder: protocol.MessageBuilder | None = None
         self._last_typing_sent = 0.0
         self._avatar_fetching: set[str] = set()
         self._avatar_workers: list[AvatarDownloadWorker] = []
@@ -192,18 +193,21 @@ class LanChatNetwork(QObject):
         self._refresh_timer.start(30000)
 
         self._discovery.update_hello(
-            protocol.build_hello(
-                self._store.config.sender_id,
-                self._store.config.user_name,
-                self._store.config.avatar_sha256,
-                self._http_port,
-                self._typing,
-            ),
+            self._message_builder().hello(self._http_port, self._typing),
             _get_local_ip(),
         )
         self.peers_updated.emit(self._discovery.snapshot())
         QTimer.singleShot(300, self.send_hello)
 
+    def _message_builder(self) -> protocol.MessageBuilder:
+        config = self._store.config
+        key = (config.sender_id, config.user_name, config.avatar_sha256 or "")
+        builder = self._builder
+        if builder is None or builder.key != key:
+            builder = protocol.MessageBuilder(*key)
+            self._builder = builder
+        return builder
+
     def send_hello(self) -> None:
         self._refresh_network_state()
         if self._store.config.avatar_path and self._store.config.avatar_sha256:
@@ -214,87 +218,43 @@ class LanChatNetwork(QObject):
                     self._store.config.avatar_sha256,
                     self._store.config.avatar_path,
                 )
-        msg = protocol.build_hello(
-            self._store.config.sender_id,
-            self._store.config.user_name,
-            self._store.config.avatar_sha256,
-            self._http_port,
-            self._typing,
-        )
+        msg = self._message_builder().hello(self._http_port, self._typing)
         self._client.send(msg)
         self._flush_queue()
 
     def send_chat(self, text: str) -> dict[str, Any]:
-        msg = protocol.build_chat(
-            self._store.config.sender_id,
-            self._store.config.user_name,
-            self._store.config.avatar_sha256,
-            text,
-        )
+        msg = self._message_builder().chat(text)
         self._send_or_queue(msg)
         return msg
 
     def send_chat_with_meta(self, text: str, meta: dict[str, Any]) -> dict[str, Any]:
-        msg = protocol.build_chat(
-            self._store.config.sender_id,
-            self._store.config.user_name,
-            self._store.config.avatar_sha256,
-            text,
-        )
+        msg = self._message_builder().chat(text)
         msg.update(meta)
         self._send_or_queue(msg)
         return msg
 
     def send_reaction(self, target_id: str, emoji: str) -> dict[str, Any]:
-        msg = protocol.build_reaction(
-            self._store.config.sender_id,
-            self._store.config.user_name,
-            self._store.config.avatar_sha256,
-            target_id,
-            emoji,
-        )
+        msg = self._message_builder().reaction(target_id, emoji)
         self._send_or_queue(msg)
         return msg
 
     def send_edit(self, target_id: str, text: str) -> dict[str, Any]:
-        msg = protocol.build_edit(
-            self._store.config.sender_id,
-            self._store.config.user_name,
-            self._store.config.avatar_sha256,
-            target_id,
-            text,
-        )
+        msg = self._message_builder().edit(target_id, text)
         self._send_or_queue(msg)
         return msg
 
     def send_undo(self, target_id: str) -> dict[str, Any]:
-        msg = protocol.build_undo(
-            self._store.config.sender_id,
-            self._store.config.user_name,
-            self._store.config.avatar_sha256,
-            target_id,
-        )
+        msg = self._message_builder().undo(target_id)
         self._send_or_queue(msg)
         return msg
 
     def send_pin(self, target_id: str, preview: str) -> dict[str, Any]:
-        msg = protocol.build_pin(
-            self._store.config.sender_id,
-            self._store.config.user_name,
-            self._store.config.avatar_sha256,
-            target_id,
-            preview,
-        )
+        msg = self._message_builder().pin(target_id, preview)
         self._send_or_queue(msg)
         return msg
 
     def send_unpin(self, target_id: str) -> dict[str, Any]:
-        msg = protocol.build_unpin(
-            self._store.config.sender_id,
-            self._store.config.user_name,
-            self._store.config.avatar_sha256,
-            target_id,
-        )
+        msg = self._message_builder().unpin(target_id)
         self._send_or_queue(msg)
         return msg
 
@@ -308,16 +268,7 @@ class LanChatNetwork(QObject):
         self._file_server.register_file(file_id, file_path)
         self._refresh_network_state()
         url = f"http://{self._last_ip}:{self._http_port}/f/{file_id}"
-        msg = protocol.build_file(
-            self._store.config.sender_id,
-            self._store.config.user_name,
-            self._store.config.avatar_sha256,
-            file_id,
-            filename,
-            size,
-            sha256,
-            url,
-        )
+        msg = self._message_builder().file(file_id, filename, size, sha256, url)
         self._send_or_queue(msg)
         return msg
 
@@ -548,4 +499,4 @@ def _create_recv_socket() -> socket.socket:
     mreq = struct.pack("4s4s", socket.inet_aton(protocol.MULTICAST_GROUP), socket.inet_aton("0.0.0.0"))
     sock.setsockopt(socket.IPPROTO_IP, socket.IP_ADD_MEMBERSHIP, mreq)
     sock.settimeout(0.5)
-    return sock
+    return sock
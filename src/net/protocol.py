@@ -1,9 +1,11 @@
 from __future__ import annotations
 
-import json
 import time
+from os import urandom
 from typing import Any
 
+from util.fastjson import dumps, loads
+
 MULTICAST_GROUP = "239.255.77.77"
 UDP_PORT = 51337
 TTL = 1
@@ -12,6 +14,9 @@ VERSION = 1
 MAX_TEXT_BYTES = 8 * 1024
 MAX_UDP_BYTES = 50 * 1024
 
+_ALLOWED_TYPES = frozenset(("HELLO", "CHAT", "FILE"))
+_ALLOWED_VERSIONS = frozenset((VERSION,))
+
 
 def now_ms() -> int:
     return int(time.time() * 1000)
@@ -19,7 +24,7 @@ def now_ms() -> int:
 
 def encode_message(payload: dict[str, Any]) -> bytes | None:
     try:
-        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        data = dumps(payload)
         if len(data) > MAX_UDP_BYTES:
             return None
         return data
@@ -29,18 +34,86 @@ def encode_message(payload: dict[str, Any]) -> bytes | None:
 
 def parse_message(data: bytes) -> dict[str, Any] | None:
     try:
-        payload = json.loads(data.decode("utf-8"))
+        payload = loads(data)
         if not isinstance(payload, dict):
             return None
-        if payload.get("v") != VERSION:
-            return None
-        if payload.get("t") not in {"HELLO", "CHAT", "FILE"}:
+        if payload.get("v") not in _ALLOWED_VERSIONS or payload.get("t") not in _ALLOWED_TYPES:
             return None
         return payload
     except Exception:
         return None
 
 
+class MessageBuilder:
+    def __init__(self, sender_id: str, name: str, avatar_sha256: str) -> None:
+        self.key = (sender_id, name, avatar_sha256 or "")
+        self._base = {
+            "v": VERSION,
+            "sender_id": sender_id,
+            "name": name,
+            "avatar_sha256": avatar_sha256 or "",
+        }
+
+    def hello(self, http_port: int, typing: bool = False) -> dict[str, Any]:
+        return {
+            "t": "HELLO",
+            **self._base,
+            "http_port": int(http_port or 0),
+            "typing": bool(typing),
+            "ts": now_ms(),
+        }
+
+    def chat(self, text: str) -> dict[str, Any]:
+        return {"t": "CHAT", **self._base, "message_id": new_message_id(), "text": text, "ts": now_ms()}
+
+    def reaction(self, target_id: str, emoji: str) -> dict[str, Any]:
+        return self._control("REACT", target_id, emoji=emoji)
+
+    def edit(self, target_id: str, text: str) -> dict[str, Any]:
+        return self._control("EDIT", target_id, text=text)
+
+    def undo(self, target_id: str) -> dict[str, Any]:
+        return self._control("UNDO", target_id)
+
+    def pin(self, target_id: str, preview: str) -> dict[str, Any]:
+        return self._control("PIN", target_id, preview=preview)
+
+    def unpin(self, target_id: str) -> dict[str, Any]:
+        return self._control("UNPIN", target_id)
+
+    def file(
+        self,
+        file_id: str,
+        filename: str,
+        size: int,
+        sha256: str,
+        url: str,
+    ) -> dict[str, Any]:
+        return {
+            "t": "FILE",
+            **self._base,
+            "message_id": new_message_id(),
+            "file_id": file_id,
+            "filename": filename,
+            "size": int(size),
+            "sha256": sha256,
+            "url": url,
+            "ts": now_ms(),
+        }
+
+    def _control(self, subtype: str, target_id: str, **extra: Any) -> dict[str, Any]:
+        msg = {
+            "t": "CHAT",
+            **self._base,
+            "message_id": new_message_id(),
+            "subtype": subtype,
+            "target_id": target_id,
+        }
+        msg.update(extra)
+        msg["ts"] = now_ms()
+        return msg
+
+
 def build_hello(
     sender_id: str,
     name: str,
@@ -48,44 +121,15 @@ def build_hello(
     http_port: int,
     typing: bool = False,
 ) -> dict[str, Any]:
-    return {
-        "t": "HELLO",
-        "v": VERSION,
-        "sender_id": sender_id,
-        "name": name,
-        "avatar_sha256": avatar_sha256 or "",
-        "http_port": int(http_port or 0),
-        "typing": bool(typing),
-        "ts": now_ms(),
-    }
+    return MessageBuilder(sender_id, name, avatar_sha256).hello(http_port, typing)
 
 
 def build_chat(sender_id: str, name: str, avatar_sha256: str, text: str) -> dict[str, Any]:
-    return {
-        "t": "CHAT",
-        "v": VERSION,
-        "message_id": _uuid(),
-        "sender_id": sender_id,
-        "name": name,
-        "avatar_sha256": avatar_sha256 or "",
-        "text": text,
-        "ts": now_ms(),
-    }
+    return MessageBuilder(sender_id, name, avatar_sha256).chat(text)
 
 
 def build_reaction(sender_id: str, name: str, avatar_sha256: str, target_id: str, emoji: str) -> dict[str, Any]:
-    return {
-        "t": "CHAT",
-        "v": VERSION,
-        "message_id": _uuid(),
-        "sender_id": sender_id,
-        "name": name,
-        "avatar_sha256": avatar_sha256 or "",
-        "subtype": "REACT",
-        "target_id": target_id,
-        "emoji": emoji,
-        "ts": now_ms(),
-    }
+    return MessageBuilder(sender_id, name, avatar_sha256).reaction(target_id, emoji)
 
 
 def build_edit(
@@ -95,61 +139,19 @@ def build_edit(
     target_id: str,
     text: str,
 ) -> dict[str, Any]:
-    return {
-        "t": "CHAT",
-        "v": VERSION,
-        "message_id": _uuid(),
-        "sender_id": sender_id,
-        "name": name,
-        "avatar_sha256": avatar_sha256 or "",
-        "subtype": "EDIT",
-        "target_id": target_id,
-        "text": text,
-        "ts": now_ms(),
-    }
+    return MessageBuilder(sender_id, name, avatar_sha256).edit(target_id, text)
 
 
 def build_undo(sender_id: str, name: str, avatar_sha256: str, target_id: str) -> dict[str, Any]:
-    return {
-        "t": "CHAT",
-        "v": VERSION,
-        "message_id": _uuid(),
-        "sender_id": sender_id,
-        "name": name,
-        "avatar_sha256": avatar_sha256 or "",
-        "subtype": "UNDO",
-        "target_id": target_id,
-        "ts": now_ms(),
-    }
+    return MessageBuilder(sender_id, name, avatar_sha256).undo(target_id)
 
 
 def build_pin(sender_id: str, name: str, avatar_sha256: str, target_id: str, preview: str) -> dict[str, Any]:
-    return {
-        "t": "CHAT",
-        "v": VERSION,
-        "message_id": _uuid(),
-        "sender_id": sender_id,
-        "name": name,
-        "avatar_sha256": avatar_sha256 or "",
-        "subtype": "PIN",
-        "target_id": target_id,
-        "preview": preview,
-        "ts": now_ms(),
-    }
+    return MessageBuilder(sender_id, name, avatar_sha256).pin(target_id, preview)
 
 
 def build_unpin(sender_id: str, name: str, avatar_sha256: str, target_id: str) -> dict[str, Any]:
-    return {
-        "t": "CHAT",
-        "v": VERSION,
-        "message_id": _uuid(),
-        "sender_id": sender_id,
-        "name": name,
-        "avatar_sha256": avatar_sha256 or "",
-        "subtype": "UNPIN",
-        "target_id": target_id,
-        "ts": now_ms(),
-    }
+    return MessageBuilder(sender_id, name, avatar_sha256).unpin(target_id)
 
 
 def build_file(
@@ -162,23 +164,8 @@ def build_file(
     sha256: str,
     url: str,
 ) -> dict[str, Any]:
-    return {
-        "t": "FILE",
-        "v": VERSION,
-        "message_id": _uuid(),
-        "sender_id": sender_id,
-        "name": name,
-        "avatar_sha256": avatar_sha256 or "",
-        "file_id": file_id,
-        "filename": filename,
-        "size": int(size),
-        "sha256": sha256,
-        "url": url,
-        "ts": now_ms(),
-    }
-
-
-def _uuid() -> str:
-    import uuid
-
-    return str(uuid.uuid4())
+    return MessageBuilder(sender_id, name, avatar_sha256).file(file_id, filename, size, sha256, url)
+
+
+def new_message_id() -> str:
+    return urandom(16).hex()
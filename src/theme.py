@@ -189,7 +189,7 @@ QLabel#avatarPreview {{
     border: 1px solid {BORDER};
     border-radius: 36px;
 }}
-QLabel#aboutBox {{
+QFrame#aboutBox {{
     background: {INPUT_BG};
     border: 1px solid {BORDER};
     border-radius: 8px;
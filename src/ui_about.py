@@ -1,42 +1,219 @@
 from __future__ import annotations
 
-from PySide6.QtCore import Qt
-from PySide6.QtGui import QFont
-from PySide6.QtWidgets import QDialog, QGraphicsDropShadowEffect, QLabel, QVBoxLayout
+import math
+from dataclasses import dataclass
+
+from PySide6.QtCore import QPointF, QRectF, QSize, Qt
+from PySide6.QtGui import QColor, QFont, QFontMetrics, QFontMetricsF, QImage, QPainter, QPixmap, QStaticText, QTransform
+from PySide6.QtWidgets import (
+    QDialog,
+    QFrame,
+    QGraphicsDropShadowEffect,
+    QGraphicsPixmapItem,
+    QGraphicsScene,
+    QLabel,
+)
 
 import app_info
-from util.i18n import t
+from ui_common import effects_enabled, setup_dialog_layout
+from util.i18n import language_code, t
+
+
+@dataclass(frozen=True)
+class FontBundle:
+    font: QFont
+    metrics: QFontMetricsF
+
+
+_instance: AboutDialog | None = None
+_instance_lang = ""
+_INFO_FONT: FontBundle | None = None
+_GLOW_CACHE: dict[tuple[str, str, int, float], QPixmap] = {}
+_GLOW_RADIUS = 12
+_STRINGS_LANG = ""
+_ABOUT_TITLE = ""
+_ABOUT_HEADER = ""
+_ABOUT_INFO = ""
+_ABOUT_VERSION = ""
+_INFO_CACHE: dict[tuple[str, str], tuple[str, tuple[QStaticText, ...], QSize]] = {}
+
+
+def _refresh_strings() -> None:
+    global _STRINGS_LANG, _ABOUT_TITLE, _ABOUT_HEADER, _ABOUT_INFO, _ABOUT_VERSION
+    lang = language_code()
+    if lang == _STRINGS_LANG:
+        return
+    _ABOUT_TITLE = t("about.title")
+    _ABOUT_HEADER = t("about.header")
+    _ABOUT_INFO = t("about.info")
+    _ABOUT_VERSION = t("about.version", version=app_info.VERSION)
+    _STRINGS_LANG = lang
+
+
+def _info_font() -> FontBundle:
+    global _INFO_FONT
+    if _INFO_FONT is None:
+        font = QFont("Consolas", 9)
+        _INFO_FONT = FontBundle(font, QFontMetricsF(font))
+    return _INFO_FONT
+
+
+def _glow_pixmap(text: str, font: QFont, color: QColor, dpr: float) -> QPixmap:
+    key = (text, font.key(), color.rgba(), dpr)
+    cached = _GLOW_CACHE.get(key)
+    if cached is not None:
+        return cached
+    metrics = QFontMetrics(font)
+    pad = _GLOW_RADIUS
+    width = metrics.horizontalAdvance(text) + pad * 2
+    height = metrics.height() + pad * 2
+    text_image = QImage(int(width * dpr), int(height * dpr), QImage.Format_ARGB32_Premultiplied)
+    text_image.setDevicePixelRatio(dpr)
+    text_image.fill(Qt.transparent)
+    painter = QPainter(text_image)
+    painter.setRenderHint(QPainter.TextAntialiasing, True)
+    painter.setFont(font)
+    painter.setPen(color)
+    painter.drawText(QRectF(0, 0, width, height), Qt.AlignCenter, text)
+    painter.end()
+
+    scene = QGraphicsScene()
+    item = QGraphicsPixmapItem(QPixmap.fromImage(text_image))
+    glow = QGraphicsDropShadowEffect()
+    glow.setBlurRadius(_GLOW_RADIUS)
+    glow.setColor(Qt.green)
+    glow.setOffset(0, 0)
+    item.setGraphicsEffect(glow)
+    scene.addItem(item)
+    scene.setSceneRect(QRectF(0, 0, width, height))
+    result = QImage(int(width * dpr), int(height * dpr), QImage.Format_ARGB32_Premultiplied)
+    result.setDevicePixelRatio(dpr)
+    result.fill(Qt.transparent)
+    painter = QPainter(result)
+    scene.render(painter, QRectF(0, 0, width, height), QRectF(0, 0, width, height))
+    painter.end()
+    pixmap = QPixmap.fromImage(result)
+    _GLOW_CACHE[key] = pixmap
+    return pixmap
+
+
+def _static_line(line: str, font: QFont) -> QStaticText:
+    static = QStaticText(line)
+    static.setTextFormat(Qt.PlainText)
+    static.setPerformanceHint(QStaticText.AggressiveCaching)
+    static.prepare(QTransform(), font)
+    return static
+
+
+class _StaticTextBox(QFrame):
+    def __init__(self, bundle: FontBundle, parent=None) -> None:
+        super().__init__(parent)
+        self._bundle = bundle
+        self._line_height = bundle.metrics.lineSpacing()
+        self._lines: tuple[QStaticText, ...] = ()
+        self._text_size = QSize()
+        self.setFont(bundle.font)
+
+    def setText(self, text: str) -> None:  # noqa: N802 - mirrors QLabel
+        font = self._bundle.font
+        key = (language_code(), font.key())
+        cached = _INFO_CACHE.get(key)
+        if cached is None or cached[0] != text:
+            parts = text.split("\n")
+            metrics = self._bundle.metrics
+            lines = tuple(_static_line(part, font) for part in parts)
+            width = max((metrics.horizontalAdvance(part) for part in parts), default=0.0)
+            height = self._line_height * len(parts)
+            cached = (text, lines, QSize(math.ceil(width), math.ceil(height)))
+            _INFO_CACHE[key] = cached
+        _text, self._lines, self._text_size = cached
+        self.updateGeometry()
+        self.update()
+
+    def sizeHint(self) -> QSize:  # noqa: N802 - Qt naming
+        extra = self.size() - self.contentsRect().size()
+        return self._text_size + extra
+
+    def minimumSizeHint(self) -> QSize:  # noqa: N802 - Qt naming
+        return self.sizeHint()
+
+    def paintEvent(self, event) -> None:  # noqa: N802 - Qt naming
+        super().paintEvent(event)
+        if not self._lines:
+            return
+        rect = self.contentsRect()
+        line_height = self._line_height
+        y = rect.top() + (rect.height() - self._text_size.height()) / 2
+        painter = QPainter(self)
+        painter.setPen(self.palette().color(self.foregroundRole()))
+        painter.setFont(self._bundle.font)
+        for line in self._lines:
+            x = rect.left() + (rect.width() - line.size().width()) / 2
+            painter.drawStaticText(QPointF(x, y), line)
+            y += line_height
+        painter.end()
 
 
 class AboutDialog(QDialog):
     def __init__(self, parent=None) -> None:
         super().__init__(parent)
-        self.setWindowTitle(t("about.title"))
         self.setModal(True)
         self.setMinimumWidth(420)
 
-        layout = QVBoxLayout(self)
-        layout.setSpacing(14)
-        layout.setContentsMargins(14, 12, 14, 12)
+        layout = setup_dialog_layout(self, spacing=14)
 
-        title = QLabel(t("about.header"))
+        title = QLabel()
         title.setObjectName("headerTitle")
         title.setAlignment(Qt.AlignCenter)
-        glow = QGraphicsDropShadowEffect(self)
-        glow.setBlurRadius(12)
-        glow.setColor(Qt.green)
-        glow.setOffset(0, 0)
-        title.setGraphicsEffect(glow)
 
-        info_box = QLabel(t("about.info"))
+        info_box = _StaticTextBox(_info_font())
         info_box.setObjectName("aboutBox")
-        info_box.setAlignment(Qt.AlignCenter)
-        font = QFont("Consolas", 9)
-        info_box.setFont(font)
 
-        version = QLabel(t("about.version", version=app_info.VERSION))
+        version = QLabel()
         version.setAlignment(Qt.AlignCenter)
+        version.setTextFormat(Qt.PlainText)
+        version.setTextInteractionFlags(Qt.NoTextInteraction)
 
         layout.addWidget(title)
         layout.addWidget(info_box)
-        layout.addWidget(version)
+        layout.addWidget(version)
+
+        self._title = title
+        self._info_box = info_box
+        self._version = version
+        self.apply_translations()
+
+    def apply_translations(self) -> None:
+        _refresh_strings()
+        self.setWindowTitle(_ABOUT_TITLE)
+        self._render_title()
+        self._info_box.setText(_ABOUT_INFO)
+        self._version.setText(_ABOUT_VERSION)
+
+    def _render_title(self) -> None:
+        title = self._title
+        if effects_enabled():
+            title.ensurePolished()
+            title.setPixmap(
+                _glow_pixmap(
+                    _ABOUT_HEADER,
+                    title.font(),
+                    title.palette().color(title.foregroundRole()),
+                    title.devicePixelRatioF(),
+                )
+            )
+        else:
+            title.setText(_ABOUT_HEADER)
+
+
+def show_about(parent=None) -> None:
+    global _instance, _instance_lang
+    lang = language_code()
+    if _instance is None:
+        _instance = AboutDialog(parent)
+    elif _instance_lang != lang:
+        _instance.apply_translations()
+    else:
+        _instance._render_title()
+    _instance_lang = lang
+    _instance.exec()
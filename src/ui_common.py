@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import os
+from functools import lru_cache
+
+from PySide6.QtCore import Qt
+from PySide6.QtWidgets import QApplication, QVBoxLayout, QWidget
+
+DIALOG_MARGINS = (14, 12, 14, 12)
+DIALOG_SPACING = 12
+
+
+def setup_dialog_layout(
+    dialog: QWidget,
+    *,
+    spacing: int = DIALOG_SPACING,
+    margins: tuple[int, int, int, int] = DIALOG_MARGINS,
+) -> QVBoxLayout:
+    layout = QVBoxLayout(dialog)
+    layout.setSpacing(spacing)
+    layout.setContentsMargins(*margins)
+    return layout
+
+
+@lru_cache(maxsize=1)
+def effects_enabled() -> bool:
+    if os.environ.get("SESSIONNAME", "").upper().startswith("RDP"):
+        return False
+    if os.environ.get("QT_QUICK_BACKEND", "").lower() == "software":
+        return False
+    if os.environ.get("QT_OPENGL", "").lower() == "software":
+        return False
+    try:
+        if QApplication.testAttribute(Qt.AA_UseSoftwareOpenGL):
+            return False
+    except Exception:
+        pass
+    return True
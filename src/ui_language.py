@@ -1,39 +1,70 @@
 from __future__ import annotations
 
-from PySide6.QtCore import Qt, Signal
-from PySide6.QtWidgets import QComboBox, QDialog, QLabel, QPushButton, QVBoxLayout
+from typing import TYPE_CHECKING
 
-from config_store import ConfigStore
-from util.i18n import available_languages, set_language, t
+from PySide6.QtCore import QThread, Qt, Signal
+from PySide6.QtWidgets import QComboBox, QDialog, QLabel, QPushButton
+
+from ui_common import setup_dialog_layout
+from util.i18n import available_languages, install_language, language_code, language_indices, read_language, t
+
+if TYPE_CHECKING:
+    from config_store import ConfigStore
+
+_STRINGS_LANG = ""
+_LANG_TITLE = ""
+_LANG_PROMPT = ""
+_COMMON_SAVE = ""
+
+
+def _refresh_strings() -> None:
+    global _STRINGS_LANG, _LANG_TITLE, _LANG_PROMPT, _COMMON_SAVE
+    lang = language_code()
+    if lang == _STRINGS_LANG:
+        return
+    _LANG_TITLE = t("lang.title")
+    _LANG_PROMPT = t("lang.prompt")
+    _COMMON_SAVE = t("common.save")
+    _STRINGS_LANG = lang
+
+
+class _LanguageLoadWorker(QThread):
+    loaded = Signal(object)
+
+    def __init__(self, code: str, parent=None) -> None:
+        super().__init__(parent)
+        self._code = code
+
+    def run(self) -> None:
+        self.loaded.emit(read_language(self._code))
 
 
 class LanguageDialog(QDialog):
     saved = Signal()
+    language_changed = Signal()
 
     def __init__(self, store: ConfigStore, parent=None) -> None:
         super().__init__(parent)
         self._store = store
-        self._language_codes: list[str] = []
+        self._lang = ""
+        self._parent_apply_translations = getattr(parent, "apply_translations", None)
+        self._loader: _LanguageLoadWorker | None = None
 
-        self.setWindowTitle(t("lang.title"))
         self.setModal(True)
         self.setMinimumWidth(360)
         self.setWindowFlag(Qt.WindowCloseButtonHint, False)
 
-        layout = QVBoxLayout(self)
-        layout.setSpacing(12)
-        layout.setContentsMargins(14, 12, 14, 12)
+        layout = setup_dialog_layout(self)
 
-        label = QLabel(t("lang.prompt"))
+        label = QLabel()
+        label.setTextFormat(Qt.PlainText)
+        label.setTextInteractionFlags(Qt.NoTextInteraction)
         self.language_select = QComboBox()
-        for code, name in available_languages():
-            self._language_codes.append(code)
-            self.language_select.addItem(name)
-        current_lang = store.config.language or "de-DE"
-        if current_lang in self._language_codes:
-            self.language_select.setCurrentIndex(self._language_codes.index(current_lang))
-
-        save_btn = QPushButton(t("common.save"))
+        languages = available_languages()
+        self._language_codes = [code for code, _name in languages]
+        self.language_select.addItems([name for _code, name in languages])
+
+        save_btn = QPushButton()
         save_btn.setObjectName("primaryButton")
         save_btn.clicked.connect(self._save)
 
@@ -41,14 +72,50 @@ class LanguageDialog(QDialog):
         layout.addWidget(self.language_select)
         layout.addWidget(save_btn, alignment=Qt.AlignRight)
 
+        self._label = label
+        self._save_btn = save_btn
+        self.sync()
+
+    def sync(self) -> None:
+        if self._lang != language_code():
+            self.apply_translations()
+        index = language_indices().get(self._store.config.language or "de-DE")
+        if index is not None:
+            self.language_select.setCurrentIndex(index)
+
+    def apply_translations(self) -> None:
+        _refresh_strings()
+        self._lang = _STRINGS_LANG
+        self.setWindowTitle(_LANG_TITLE)
+        self._label.setText(_LANG_PROMPT)
+        self._save_btn.setText(_COMMON_SAVE)
+
     def _save(self) -> None:
-        if self._language_codes:
-            self._store.config.language = self._language_codes[self.language_select.currentIndex()]
-        self._store.config.first_run_complete = True
-        self._store.save()
-        set_language(self._store.config.language)
-        parent = self.parent()
-        if parent is not None and hasattr(parent, "apply_translations"):
-            parent.apply_translations()
+        with self._store.mutate() as config:
+            if self._language_codes:
+                config.language = self._language_codes[self.language_select.currentIndex()]
+            config.first_run_complete = True
+            new_lang = config.language
+        if new_lang == language_code():
+            self._finish()
+            return
+        self._save_btn.setEnabled(False)
+        loader = _LanguageLoadWorker(new_lang, self)
+        loader.loaded.connect(self._on_language_loaded)
+        loader.finished.connect(loader.deleteLater)
+        self._loader = loader
+        loader.start()
+
+    def _on_language_loaded(self, bundle: tuple) -> None:
+        self._loader = None
+        self._save_btn.setEnabled(True)
+        install_language(bundle)
+        self.apply_translations()
+        if self._parent_apply_translations is not None:
+            self._parent_apply_translations()
+        self.language_changed.emit()
+        self._finish()
+
+    def _finish(self) -> None:
         self.saved.emit()
         self.accept()
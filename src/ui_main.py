@@ -1,22 +1,30 @@
 from __future__ import annotations
 
 import ctypes
-import gzip
 import hashlib
 import html
 import io
+import ipaddress
 import json
+import math
 import os
+import re
+import shutil
+import ssl
+import threading
 import time
+import urllib.error
 import urllib.parse
 import urllib.request
 import zlib
+from collections import OrderedDict
+from functools import lru_cache
 from html.parser import HTMLParser
 from pathlib import Path
 from typing import Any
 
-from PySide6.QtCore import Qt, QThread, QTimer, Signal, QSize, QEvent, QPoint, QRect, QRectF, QUrl
-from PySide6.QtGui import QColor, QPainter, QPainterPath, QPen, QPixmap, QDesktopServices
+from PySide6.QtCore import Qt, QObject, QSignalMapper, QTimer, Signal, QSize, QEvent, QPoint, QRect, QRectF, QUrl
+from PySide6.QtGui import QColor, QFont, QFontMetrics, QPainter, QPainterPath, QPen, QPixmap, QDesktopServices, QPixmapCache, QRegion, QTransform
 from PySide6.QtWidgets import (
     QApplication,
     QDialog,
@@ -46,11 +54,30 @@ import app_info
 import theme as theme_mod
 from config_store import ConfigStore
 from net import protocol
+from ui_common import effects_enabled
 from util.images import load_avatar_pixmap, generate_qr_pixmap
 from util.i18n import t
 from util.markdown_render import render_markdown, extract_first_url
-from util.paths import attachment_cache_path, downloads_dir, logs_dir
+from util.paths import attachment_cache_path, cache_dir, downloads_dir, logs_dir
 from util.timefmt import fmt_time, fmt_time_seconds
+from util.workers import DaemonPool
+
+try:
+    from selectolax.parser import HTMLParser as _FastHTMLParser
+except Exception:  # pragma: no cover - selectolax missing
+    _FastHTMLParser = None
+
+try:
+    import brotli
+
+    brotli.Decompressor().process(b"", output_buffer_limit=1)
+except Exception:  # pragma: no cover - brotli missing or too old to bound its output
+    brotli = None
+
+try:
+    import zstandard
+except Exception:  # pragma: no cover - zstandard missing
+    zstandard = None
 
 
 class SendTextEdit(QTextEdit):
@@ -64,7 +91,59 @@ class SendTextEdit(QTextEdit):
         super().keyPressEvent(event)
 
 
-class DownloadWorker(QThread):
+class _PoolWorker(QObject):
+    def __init__(self) -> None:
+        super().__init__()
+        self._running = False
+
+    def start(self) -> None:
+        self._running = True
+        _NET_POOL.submit(self._run_guarded)
+
+    def isRunning(self) -> bool:  # noqa: N802 - mirrors QThread
+        return self._running
+
+    def _run_guarded(self) -> None:
+        try:
+            self.run()
+        finally:
+            self._running = False
+
+
+_DOWNLOAD_OPEN_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+
+
+class _ProgressWriter:
+    def __init__(self, fd: int, total_size: int, report) -> None:
+        self._fd = fd
+        self._total = total_size
+        self._report = report
+        self._written = 0
+        self._last_report = 0.0
+        self._last_pct = -1
+
+    def write(self, data: bytes) -> int:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(self._fd, view) :]
+        self._written += len(data)
+        if self._total:
+            pct = int((self._written / self._total) * 100)
+            if pct != self._last_pct:
+                now = time.monotonic()
+                if now - self._last_report >= 0.1:
+                    self._last_report = now
+                    self._last_pct = pct
+                    self._report(pct)
+        return len(data)
+
+    def finish(self) -> None:
+        if self._total and self._last_pct != 100:
+            self._last_pct = 100
+            self._report(100)
+
+
+class DownloadWorker(_PoolWorker):
     progress = Signal(str, int)
     finished = Signal(str, str)
     failed = Signal(str, str)
@@ -75,30 +154,31 @@ class DownloadWorker(QThread):
         self._dest_path = dest_path
         self._file_name = file_name
 
+    def _emit_progress(self, pct: int) -> None:
+        self.progress.emit(self._file_name, pct)
+
     def run(self) -> None:
         try:
             req = urllib.request.Request(self._url, headers={"User-Agent": "WalkuerLanChat"})
-            with urllib.request.urlopen(req, timeout=10) as resp:
+            with _HTTP_OPENER.open(req, timeout=10) as resp:
                 total = resp.headers.get("Content-Length")
                 total_size = int(total) if total else 0
                 Path(self._dest_path).parent.mkdir(parents=True, exist_ok=True)
-                downloaded = 0
-                with open(self._dest_path, "wb") as f:
-                    while True:
-                        chunk = resp.read(1024 * 128)
-                        if not chunk:
-                            break
-                        f.write(chunk)
-                        downloaded += len(chunk)
-                        if total_size:
-                            pct = int((downloaded / total_size) * 100)
-                            self.progress.emit(self._file_name, pct)
+                fd = os.open(self._dest_path, _DOWNLOAD_OPEN_FLAGS, 0o644)
+                try:
+                    if hasattr(os, "posix_fadvise"):
+                        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                    writer = _ProgressWriter(fd, total_size, self._emit_progress)
+                    shutil.copyfileobj(resp, writer, 1 << 20)
+                    writer.finish()
+                finally:
+                    os.close(fd)
             self.finished.emit(self._file_name, self._dest_path)
         except Exception as exc:
             self.failed.emit(self._file_name, str(exc))
 
 
-class ImageFetchWorker(QThread):
+class ImageFetchWorker(_PoolWorker):
     finished = Signal(str)
     failed = Signal(str)
 
@@ -110,7 +190,7 @@ class ImageFetchWorker(QThread):
     def run(self) -> None:
         try:
             req = urllib.request.Request(self._url, headers={"User-Agent": "WalkuerLanChat"})
-            with urllib.request.urlopen(req, timeout=10) as resp:
+            with _HTTP_OPENER.open(req, timeout=10) as resp:
                 data = resp.read()
             if not data:
                 raise ValueError("empty image response")
@@ -122,7 +202,7 @@ class ImageFetchWorker(QThread):
             self.failed.emit(self._dest_path)
 
 
-class LinkThumbFetchWorker(QThread):
+class LinkThumbFetchWorker(_PoolWorker):
     finished = Signal(str, str)
     failed = Signal(str, str)
 
@@ -136,7 +216,7 @@ class LinkThumbFetchWorker(QThread):
     def run(self) -> None:
         try:
             req = urllib.request.Request(self._url, headers=_LINKPREVIEW_IMAGE_HEADERS)
-            with urllib.request.urlopen(req, timeout=10) as resp:
+            with _HTTP_OPENER.open(req, timeout=10) as resp:
                 content_type = (resp.headers.get("Content-Type") or "").lower()
                 if "text/html" in content_type:
                     raise RuntimeError("unexpected html response")
@@ -160,9 +240,12 @@ class LinkThumbFetchWorker(QThread):
             self.failed.emit(self._dest_path, str(exc))
 
 
+_HEAD_TAGS = frozenset(("meta", "link", "title", "base"))
+
+
 class _LinkPreviewHTMLParser(HTMLParser):
-    def __init__(self) -> None:
-        super().__init__()
+    def reset(self) -> None:
+        super().reset()
         self.meta: dict[str, str] = {}
         self.title_parts: list[str] = []
         self.base_href = ""
@@ -171,10 +254,16 @@ class _LinkPreviewHTMLParser(HTMLParser):
         self.link_icon = ""
         self.link_apple_icon = ""
         self._in_title = False
+        self.decoded = False
 
     def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
         tag = (tag or "").lower()
-        attrs_map = {str(k).lower(): v for k, v in attrs if k}
+        if tag not in _HEAD_TAGS:
+            return
+        if tag == "title":
+            self._in_title = True
+            return
+        attrs_map = {k.lower(): v for k, v in attrs if k}
         if tag == "meta":
             key = (
                 attrs_map.get("property")
@@ -185,22 +274,20 @@ class _LinkPreviewHTMLParser(HTMLParser):
             key = key.lower()
             content = (attrs_map.get("content") or attrs_map.get("href") or "").strip()
             if key and content and key not in self.meta:
-                self.meta[key] = html.unescape(content)
+                self.meta[key] = self._text(content)
         elif tag == "link":
             rel = (attrs_map.get("rel") or "").lower()
             href = (attrs_map.get("href") or attrs_map.get("content") or "").strip()
             if not href:
                 return
             if "canonical" in rel and not self.link_canonical:
-                self.link_canonical = html.unescape(href)
+                self.link_canonical = self._text(href)
             if "image_src" in rel and not self.link_image_src:
-                self.link_image_src = html.unescape(href)
+                self.link_image_src = self._text(href)
             if "apple-touch-icon" in rel and not self.link_apple_icon:
-                self.link_apple_icon = html.unescape(href)
+                self.link_apple_icon = self._text(href)
             if "icon" in rel and not self.link_icon:
-                self.link_icon = html.unescape(href)
-        elif tag == "title":
-            self._in_title = True
+                self.link_icon = self._text(href)
         elif tag == "base":
             href = (attrs_map.get("href") or "").strip()
             if href and not self.base_href:
@@ -216,10 +303,96 @@ class _LinkPreviewHTMLParser(HTMLParser):
 
     @property
     def title(self) -> str:
-        return html.unescape("".join(self.title_parts)).strip()
+        return self._text("".join(self.title_parts)).strip()
+
+    def _text(self, value: str) -> str:
+        return value if self.decoded else html.unescape(value)
+
 
+_PARSER_LOCAL = threading.local()
 
-class LinkPreviewWorker(QThread):
+
+def _head_parser() -> _LinkPreviewHTMLParser:
+    parser = getattr(_PARSER_LOCAL, "parser", None)
+    if parser is None:
+        parser = _LinkPreviewHTMLParser()
+        _PARSER_LOCAL.parser = parser
+    else:
+        parser.reset()
+    return parser
+
+
+def _parse_head(html_text: str) -> _LinkPreviewHTMLParser:
+    parser = _head_parser()
+    if _FastHTMLParser is not None:
+        try:
+            tree = _FastHTMLParser(html_text)
+            parser.decoded = True
+            for node in tree.css("meta, link, base"):
+                parser.handle_starttag(node.tag, list(node.attributes.items()))
+            title = tree.css_first("title")
+            if title is not None:
+                parser.title_parts.append(title.text() or "")
+            return parser
+        except Exception:
+            parser.reset()
+    parser.feed(html_text)
+    parser.close()
+    return parser
+
+
+class _BodyDecoder:
+    def __init__(self, resp, encoding: str) -> None:
+        self._resp = resp
+        self._kind = ""
+        self._obj = None
+        self._raw_fallback = False
+        if "gzip" in encoding:
+            self._kind = "zlib"
+            self._obj = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        elif "deflate" in encoding:
+            self._kind = "zlib"
+            self._obj = zlib.decompressobj()
+            self._raw_fallback = True
+        elif "br" in encoding:
+            if brotli is None:
+                raise RuntimeError("brotli unsupported")
+            self._kind = "br"
+            self._obj = brotli.Decompressor()
+        elif "zstd" in encoding:
+            if zstandard is None:
+                raise RuntimeError("zstd unsupported")
+            self._kind = "zstd"
+            self._obj = zstandard.ZstdDecompressor().stream_reader(resp, read_size=_BODY_READ_SIZE, closefd=False)
+
+    def read(self, max_length: int) -> bytes | None:
+        if self._kind == "zlib":
+            return self._read_zlib(max_length)
+        if self._kind == "zstd":
+            return self._obj.read(max_length) or None
+        chunk = self._resp.read(_BODY_READ_SIZE if self._kind else min(_BODY_READ_SIZE, max_length))
+        if not chunk:
+            return None
+        if self._kind == "br":
+            return self._obj.process(chunk, output_buffer_limit=max_length)
+        return chunk
+
+    def _read_zlib(self, max_length: int) -> bytes | None:
+        chunk = self._obj.unconsumed_tail or self._resp.read(_BODY_READ_SIZE)
+        if not chunk:
+            return None
+        try:
+            out = self._obj.decompress(chunk, max_length)
+        except zlib.error:
+            if not self._raw_fallback:
+                raise
+            self._obj = zlib.decompressobj(-zlib.MAX_WBITS)
+            out = self._obj.decompress(chunk, max_length)
+        self._raw_fallback = False
+        return out
+
+
+class LinkPreviewWorker(_PoolWorker):
     finished = Signal(str, dict)
     failed = Signal(str, str)
 
@@ -230,42 +403,78 @@ class LinkPreviewWorker(QThread):
     def run(self) -> None:
         try:
             target_url = _normalize_preview_url(self._url)
+            if not _is_previewable_url(target_url):
+                self.failed.emit(self._url, "unsupported_url")
+                return
+            cached = _preview_cache_get(target_url)
+            if cached is not None:
+                self.finished.emit(self._url, cached)
+                return
+            stored = _preview_disk_get(target_url)
+            if stored is not None and time.time() - stored.get("fetched_at", 0) < _PREVIEW_TTL:
+                preview = dict(stored.get("preview") or {})
+                _preview_cache_put(target_url, preview)
+                self.finished.emit(self._url, preview)
+                return
+            validators = {"etag": "", "last_modified": ""}
+
             def fetch_html(url: str, headers: dict[str, str]) -> tuple[str, str, str]:
-                req = urllib.request.Request(url, headers=headers)
-                with urllib.request.urlopen(req, timeout=10) as resp:
-                    max_bytes = 512 * 1024
-                    data = bytearray()
-                    while len(data) < max_bytes:
-                        chunk = resp.read(1024 * 64)
-                        if not chunk:
-                            break
-                        data.extend(chunk)
-                        if len(data) >= max_bytes:
-                            break
+                req = urllib.request.Request(url, headers={**headers, "Range": _LINKPREVIEW_RANGE})
+                try:
+                    resp = _HTTP_OPENER.open(req, timeout=10)
+                except urllib.error.HTTPError as exc:
+                    if exc.code != 416:
+                        raise
+                    resp = _HTTP_OPENER.open(urllib.request.Request(url, headers=headers), timeout=10)
+                with resp:
                     final = resp.geturl() or url
                     charset = resp.headers.get_content_charset() or "utf-8"
                     enc = (resp.headers.get("Content-Encoding") or "").lower()
-                raw = bytes(data)
-                if enc:
+                    if url == target_url:
+                        validators["etag"] = resp.headers.get("ETag") or ""
+                        validators["last_modified"] = resp.headers.get("Last-Modified") or ""
+                    max_bytes = _LINKPREVIEW_MAX_HTML
+                    data = bytearray()
+                    head_end = None
                     try:
-                        if "gzip" in enc:
-                            raw = gzip.decompress(raw)
-                        elif "deflate" in enc:
-                            try:
-                                raw = zlib.decompress(raw)
-                            except zlib.error:
-                                raw = zlib.decompress(raw, -zlib.MAX_WBITS)
-                        elif "br" in enc:
-                            raise RuntimeError("brotli unsupported")
+                        decoder = _BodyDecoder(resp, enc)
+                        while len(data) < max_bytes:
+                            out = decoder.read(max_bytes - len(data))
+                            if out is None:
+                                break
+                            start = max(0, len(data) - 16)
+                            data.extend(out)
+                            head_end = _HEAD_END_RE.search(data, start)
+                            if head_end is not None:
+                                break
                     except Exception as exc:
                         _log_link_preview(f"linkpreview_fail url={url} reason=decompress:{exc}")
                         raise
-                return raw.decode(charset, errors="replace"), final, enc
-
-            html_text, final_url, encoding = fetch_html(target_url, _LINKPREVIEW_HTML_HEADERS)
-            parser = _LinkPreviewHTMLParser()
-            parser.feed(html_text)
-            parser.close()
+                if head_end is not None:
+                    del data[head_end.end():]
+                return data.decode(charset, errors="replace"), final, enc
+
+            facebook_ua = _is_facebook_host(target_url)
+            request_headers = _LINKPREVIEW_FB_HEADERS if facebook_ua else _LINKPREVIEW_HTML_HEADERS
+            if stored is not None:
+                request_headers = dict(request_headers)
+                if stored.get("etag"):
+                    request_headers["If-None-Match"] = stored["etag"]
+                if stored.get("last_modified"):
+                    request_headers["If-Modified-Since"] = stored["last_modified"]
+            try:
+                html_text, final_url, encoding = fetch_html(target_url, request_headers)
+            except urllib.error.HTTPError as exc:
+                if exc.code == 304 and stored is not None:
+                    preview = dict(stored.get("preview") or {})
+                    _preview_disk_put(target_url, preview, stored.get("etag") or "", stored.get("last_modified") or "")
+                    _preview_cache_put(target_url, preview)
+                    self.finished.emit(self._url, preview)
+                    return
+                if not facebook_ua or not 400 <= exc.code < 500:
+                    raise
+                html_text, final_url, encoding = fetch_html(target_url, _LINKPREVIEW_HTML_HEADERS)
+            parser = _parse_head(html_text)
             meta = parser.meta
 
             title = _first_meta_value(meta, ["og:title", "twitter:title", "title"])
@@ -288,13 +497,9 @@ class LinkPreviewWorker(QThread):
                 target_url,
             )
 
-            if not has_strong and _is_facebook_host(canonical_url or target_url):
-                fb_headers = dict(_LINKPREVIEW_HTML_HEADERS)
-                fb_headers["User-Agent"] = _FACEBOOK_UA
-                html_text, final_url, encoding = fetch_html(target_url, fb_headers)
-                parser = _LinkPreviewHTMLParser()
-                parser.feed(html_text)
-                parser.close()
+            if not has_strong and not facebook_ua and _is_facebook_host(canonical_url):
+                html_text, final_url, encoding = fetch_html(target_url, _LINKPREVIEW_FB_HEADERS)
+                parser = _parse_head(html_text)
                 meta = parser.meta
                 title = _first_meta_value(meta, ["og:title", "twitter:title", "title"]) or parser.title or title
                 description = _first_meta_value(
@@ -350,13 +555,15 @@ class LinkPreviewWorker(QThread):
                 "image_url": image_url,
                 "_encoding": encoding,
             }
+            _preview_cache_put(target_url, preview)
+            _preview_disk_put(target_url, preview, validators["etag"], validators["last_modified"])
             self.finished.emit(self._url, preview)
         except Exception as exc:
             _log_link_preview(f"linkpreview_fail url={self._url} reason={exc}")
             self.failed.emit(self._url, str(exc))
 
 
-class LinkThumbWorker(QThread):
+class LinkThumbWorker(_PoolWorker):
     finished = Signal(str, str, str)
     failed = Signal(str, str)
 
@@ -485,24 +692,25 @@ class UserListItem(QFrame):
             label = t("user.self", name=raw_name)
         self._name_label.setText(label)
 
-        pixmap = load_avatar_pixmap(avatar_path, name, avatar_sha, 28)
-        self._avatar.setPixmap(pixmap)
+        self._avatar.setPixmap(_avatar_pixmap(avatar_path, name, avatar_sha, 28))
 
         if typing:
             self._status_label.setText(t("user.typing"))
-            self._status_label.setObjectName("userStatusTyping")
+            status_name = "userStatusTyping"
         else:
             time_stamp = fmt_time_seconds(last_seen) if last_seen else ""
             suffix = t("user.last_seen", time=time_stamp) if time_stamp else ""
             self._status_label.setText(t("user.online") + suffix)
-            self._status_label.setObjectName("userStatus")
-        self._status_label.style().unpolish(self._status_label)
-        self._status_label.style().polish(self._status_label)
+            status_name = "userStatus"
+        if self._status_label.objectName() != status_name:
+            self._status_label.setObjectName(status_name)
+            self._status_label.style().unpolish(self._status_label)
+            self._status_label.style().polish(self._status_label)
 
     def refresh_avatar(self, avatar_path: str, avatar_sha: str, name: str) -> None:
         self.avatar_sha = avatar_sha
-        pixmap = load_avatar_pixmap(avatar_path, name, avatar_sha, 28)
-        self._avatar.setPixmap(pixmap)
+        _drop_avatar_pixmaps(avatar_sha)
+        self._avatar.setPixmap(_avatar_pixmap(avatar_path, name, avatar_sha, 28))
 
     def raw_name(self) -> str:
         return self._raw_name
@@ -524,10 +732,15 @@ class ChatBubble(QFrame):
     pin_requested = Signal(dict)
     unpin_requested = Signal(dict)
 
-    def __init__(self, msg: dict, is_self: bool, theme_key: str, parent=None) -> None:
+    def __init__(self, msg: dict, is_self: bool, theme_key: str, parent=None, from_history: bool = False) -> None:
         super().__init__(parent)
         self.msg = msg
+        self._from_history = from_history
         self._reactions: dict[str, set[str]] = {}
+        self._search_blob: str | None = None
+        self._reaction_bar: QFrame | None = None
+        self._reaction_layout: QHBoxLayout | None = None
+        self._reaction_chips: dict[str, tuple[QFrame, QLabel]] = {}
         self._file_status: QLabel | None = None
         self._preview_label: ClickableLabel | None = None
         self._preview_path: str | None = None
@@ -555,6 +768,9 @@ class ChatBubble(QFrame):
         self._download_btn: QPushButton | None = None
         self._file_status_key = "file.ready"
         self._download_pct: int | None = None
+        self._download_ts = 0.0
+        self._shape_key: tuple[int, int, bool] | None = None
+        self._shape: tuple[QPainterPath, QRect, QRegion] | None = None
 
         self.setObjectName("chatBubbleSelf" if is_self else "chatBubble")
         self.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Minimum)
@@ -591,19 +807,13 @@ class ChatBubble(QFrame):
         self._react_btn.setToolTip(t("chat.react"))
         self._react_btn.clicked.connect(self._open_reaction_menu)
 
-        self._qr_btn = QToolButton()
-        self._qr_btn.setObjectName("qrToggleButton")
-        self._qr_btn.setText("QR")
-        self._qr_btn.setToolTip(t("qr.show"))
-        self._qr_btn.clicked.connect(self._toggle_qr)
-        self._qr_btn.hide()
-
         header.addWidget(name_label)
         header.addStretch(1)
-        header.addWidget(self._qr_btn)
         header.addWidget(self._reply_btn)
         header.addWidget(self._react_btn)
         body.addLayout(header)
+        self._header = header
+        self._body = body
 
         reply_to = msg.get("reply_to")
         if reply_to:
@@ -647,15 +857,6 @@ class ChatBubble(QFrame):
             )
             body.addWidget(self._text_widget)
 
-            self._qr_label = QLabel()
-            self._qr_label.setObjectName("qrCode")
-            self._qr_label.setFixedSize(128, 128)
-            self._qr_label.setAlignment(Qt.AlignCenter)
-            self._qr_label.setScaledContents(False)
-            self._qr_label.hide()
-            align = Qt.AlignRight if self._is_self else Qt.AlignLeft
-            body.addWidget(self._qr_label, alignment=align)
-
             self._set_text_content(msg.get("text") or "", bool(msg.get("deleted")))
         else:
             file_box = QFrame()
@@ -708,14 +909,6 @@ class ChatBubble(QFrame):
             file_layout.addLayout(action_row)
             body.addWidget(file_box)
 
-        self._reaction_bar = QFrame()
-        self._reaction_bar.setObjectName("reactionBar")
-        self._reaction_layout = QHBoxLayout(self._reaction_bar)
-        self._reaction_layout.setContentsMargins(0, 0, 0, 0)
-        self._reaction_layout.setSpacing(6)
-        self._reaction_bar.hide()
-        body.addWidget(self._reaction_bar)
-
         footer = QHBoxLayout()
         footer.setContentsMargins(0, 0, 0, 0)
         footer.addStretch(1)
@@ -727,6 +920,7 @@ class ChatBubble(QFrame):
 
     def resizeEvent(self, event):  # noqa: N802 - Qt naming
         super().resizeEvent(event)
+        self._shape = None
         self._update_reply_preview_height()
 
     def apply_translations(self) -> None:
@@ -760,49 +954,102 @@ class ChatBubble(QFrame):
         if w <= 0 or h <= 0:
             return
 
+        is_self = self._is_self
         colors = theme_mod.get_bubble_colors(self._theme_key)
-        bg = colors.get("bubble_self_bg") if self._is_self else colors.get("bubble_bg")
-        border = colors.get("bubble_self_border") if self._is_self else colors.get("bubble_border")
+        if is_self:
+            bg = colors.get("bubble_self_bg")
+            border = colors.get("bubble_self_border")
+        else:
+            bg = colors.get("bubble_bg")
+            border = colors.get("bubble_border")
         if self.property("flash") is True:
             border = colors.get("neon_green", "#39ff14")
 
-        bw = float(self.BORDER_W)
-        tail_y = max(self.RADIUS + 6, h - self.TAIL_H - 10)
-        tail_mid = tail_y + (self.TAIL_H / 2.0)
-        tail_y2 = tail_y + self.TAIL_H
-
-        if self._is_self:
-            body_rect = QRectF(0, 0, w - self.TAIL_OUT, h)
-            base_x = w - self.TAIL_OUT
-            tip_x = w
-            dir_sign = 1.0
-        else:
-            body_rect = QRectF(self.TAIL_OUT, 0, w - self.TAIL_OUT, h)
-            base_x = self.TAIL_OUT
-            tip_x = 0
-            dir_sign = -1.0
-
-        body_rect = body_rect.adjusted(bw / 2, bw / 2, -bw / 2, -bw / 2)
-        body_path = QPainterPath()
-        body_path.addRoundedRect(body_rect, self.RADIUS, self.RADIUS)
-
-        ctrl_x = base_x + dir_sign * (self.TAIL_OUT * 0.45)
-        tail_path = QPainterPath()
-        tail_path.moveTo(base_x, tail_y)
-        tail_path.cubicTo(ctrl_x, tail_y + self.TAIL_H * 0.2, tip_x, tail_mid - self.TAIL_H * 0.2, tip_x, tail_mid)
-        tail_path.cubicTo(tip_x, tail_mid + self.TAIL_H * 0.2, ctrl_x, tail_y2 - self.TAIL_H * 0.2, base_x, tail_y2)
-        tail_path.closeSubpath()
-
-        shape = body_path.united(tail_path)
+        dpr = self.devicePixelRatioF()
+        key = f"bub:{w}x{h}:{int(is_self)}:{dpr}:{bg}:{border}"
+        pixmap = QPixmap()
+        if not QPixmapCache.find(key, pixmap):
+            pixmap = self._render_bubble(w, h, dpr, QColor(bg), QColor(border))
+            QPixmapCache.insert(key, pixmap)
 
         painter = QPainter(self)
+        painter.drawPixmap(0, 0, pixmap)
+        painter.end()
+
+    def _render_bubble(self, w: int, h: int, dpr: float, fill: QColor, border: QColor) -> QPixmap:
+        shape, inner, edge_clip = self._bubble_shape(w, h)
+        pixmap = QPixmap(math.ceil(w * dpr), math.ceil(h * dpr))
+        pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(Qt.transparent)
+
+        painter = QPainter(pixmap)
+        if not inner.isEmpty():
+            painter.fillRect(inner, fill)
+            painter.setClipRegion(edge_clip)
         painter.setRenderHint(QPainter.Antialiasing, True)
-        painter.fillPath(shape, QColor(bg))
-        pen = QPen(QColor(border), bw)
+        painter.fillPath(shape, fill)
+        painter.setClipping(False)
+        pen = QPen(border, float(self.BORDER_W))
         pen.setJoinStyle(Qt.RoundJoin)
         pen.setCapStyle(Qt.RoundCap)
         painter.setPen(pen)
         painter.drawPath(shape)
+        painter.end()
+        return pixmap
+
+    def _bubble_shape(self, w: int, h: int) -> tuple[QPainterPath, QRect, QRegion]:
+        is_self = self._is_self
+        key = (w, h, is_self)
+        if self._shape is not None and self._shape_key == key:
+            return self._shape
+
+        # Built as a single contour with the tail on the right, mirrored for incoming bubbles.
+        bw_half = self.BORDER_W * 0.5
+        radius = self.RADIUS
+        tail_out = self.TAIL_OUT
+        tail_h = self.TAIL_H
+        left = bw_half
+        top = bw_half
+        right = w - tail_out - bw_half
+        bottom = h - bw_half
+        tip_x = w
+        ctrl_x = right + tail_out * 0.45
+        diameter = radius * 2
+
+        # The tail sits between the right-hand corner arcs; on short bubbles it shrinks to fit.
+        tail_y2 = min(max(radius + 6, h - tail_h - 10) + tail_h, bottom - radius)
+        tail_y = max(tail_y2 - tail_h, top + radius)
+        tail_mid = (tail_y + tail_y2) / 2.0
+        tail_bend = (tail_y2 - tail_y) * 0.2
+
+        shape = QPainterPath()
+        shape.moveTo(left + radius, top)
+        shape.arcTo(QRectF(right - diameter, top, diameter, diameter), 90, -90)
+        if tail_y2 > tail_y:
+            shape.lineTo(right, tail_y)
+            shape.cubicTo(ctrl_x, tail_y + tail_bend, tip_x, tail_mid - tail_bend, tip_x, tail_mid)
+            shape.cubicTo(tip_x, tail_mid + tail_bend, ctrl_x, tail_y2 - tail_bend, right, tail_y2)
+        shape.arcTo(QRectF(right - diameter, bottom - diameter, diameter, diameter), 0, -90)
+        shape.arcTo(QRectF(left, bottom - diameter, diameter, diameter), 270, -90)
+        shape.arcTo(QRectF(left, top, diameter, diameter), 180, -90)
+        shape.closeSubpath()
+        if not is_self:
+            shape = QTransform(-1, 0, 0, 1, w, 0).map(shape)
+            left, right = w - right, w - left
+
+        inner_left = math.ceil(left + radius)
+        inner_top = math.ceil(top)
+        inner = QRect(
+            inner_left,
+            inner_top,
+            max(0, math.floor(right - radius) - inner_left),
+            max(0, math.floor(bottom) - inner_top),
+        )
+        edge_clip = QRegion(0, 0, w, h).subtracted(QRegion(inner))
+
+        self._shape_key = key
+        self._shape = (shape, inner, edge_clip)
+        return self._shape
 
     def _update_reply_preview_height(self) -> None:
         if not self._reply_preview:
@@ -810,9 +1057,7 @@ class ChatBubble(QFrame):
         width = self._reply_preview.width()
         if width <= 0:
             return
-        metrics = self._reply_preview.fontMetrics()
-        rect = metrics.boundingRect(0, 0, width, 10_000, Qt.TextWordWrap, self._reply_preview.text())
-        target = rect.height() + 2
+        target = _wrapped_text_height(self._reply_preview.text(), width, self._reply_preview.font().toString()) + 2
         if self._reply_preview.minimumHeight() != target:
             self._reply_preview.setMinimumHeight(target)
             self._reply_preview.updateGeometry()
@@ -867,6 +1112,11 @@ class ChatBubble(QFrame):
                 self._progress.hide()
 
     def set_download_progress(self, pct: int) -> None:
+        now = time.monotonic()
+        if self._file_status_key == "download.loading" and pct < 100:
+            if pct == self._download_pct or now - self._download_ts < 0.05:
+                return
+        self._download_ts = now
         self._file_status_key = "download.loading"
         self._download_pct = pct
         if self._progress is not None:
@@ -889,11 +1139,7 @@ class ChatBubble(QFrame):
         if pixmap.isNull():
             return
         self._preview_path = path
-        scaled = pixmap.scaled(
-            self._preview_label.size(),
-            Qt.KeepAspectRatio,
-            Qt.SmoothTransformation,
-        )
+        scaled = _scale_pixmap(pixmap, self._preview_label.size(), Qt.KeepAspectRatio)
         self._preview_label.setPixmap(scaled)
         self._preview_label.show()
 
@@ -903,15 +1149,16 @@ class ChatBubble(QFrame):
     def apply_edit(self, text: str) -> None:
         if not self._text_widget:
             return
-        self.msg["text"] = text
-        self.msg["edited"] = True
+        self.msg = {**self.msg, "text": text, "edited": True}
+        self._search_blob = None
         self._set_text_content(text, False)
         self._update_time_label()
 
     def apply_undo(self) -> None:
         if not self._text_widget:
             return
-        self.msg["deleted"] = True
+        self.msg = {**self.msg, "deleted": True}
+        self._search_blob = None
         self._set_text_content("", True)
         self._update_time_label()
 
@@ -998,7 +1245,7 @@ class ChatBubble(QFrame):
             _log_thumb_cache(thumb_file_id, reused=False, src_changed=True)
         else:
             _log_thumb_cache(thumb_file_id, reused=False, src_changed=False)
-        if self.msg.get("_from_history"):
+        if self._from_history:
             self._link_preview_thumb.hide()
             return
         self._set_link_preview_thumb_placeholder("...")
@@ -1052,15 +1299,17 @@ class ChatBubble(QFrame):
             return
         if deleted:
             self._text_widget.setText(t("chat.message_deleted_html"))
-            self._text_widget.setObjectName("chatTextMuted")
+            style_name = "chatTextMuted"
             self._update_qr_code("")
         else:
             self._text_widget.setText(render_markdown(text))
-            self._text_widget.setObjectName("chatText")
+            style_name = "chatText"
             self._update_qr_code(text)
-        self._text_widget.style().unpolish(self._text_widget)
-        self._text_widget.style().polish(self._text_widget)
-        self._text_widget.updateGeometry()
+        if self._text_widget.objectName() != style_name:
+            self._text_widget.setObjectName(style_name)
+            self._text_widget.style().unpolish(self._text_widget)
+            self._text_widget.style().polish(self._text_widget)
+            self._text_widget.updateGeometry()
 
     def _update_time_label(self) -> None:
         if not self._time_label:
@@ -1076,8 +1325,34 @@ class ChatBubble(QFrame):
             return
         QDesktopServices.openUrl(QUrl(url))
 
+    def _ensure_qr_label(self) -> QLabel:
+        if self._qr_label is None:
+            self._qr_label = QLabel()
+            self._qr_label.setObjectName("qrCode")
+            self._qr_label.setFixedSize(128, 128)
+            self._qr_label.setAlignment(Qt.AlignCenter)
+            self._qr_label.setScaledContents(False)
+            self._qr_label.hide()
+            align = Qt.AlignRight if self._is_self else Qt.AlignLeft
+            self._body.insertWidget(self._body.indexOf(self._text_widget) + 1, self._qr_label, alignment=align)
+        return self._qr_label
+
+    def _clear_qr(self) -> None:
+        if self._qr_label is not None:
+            self._qr_label.hide()
+            self._qr_label.clear()
+        self._qr_url = None
+        self._qr_visible = False
+        self._refresh_qr_buttons(False)
+
     def _refresh_qr_buttons(self, available: bool) -> None:
         label = t("qr.hide") if self._qr_visible else t("qr.show")
+        if self._qr_btn is None and available and not self._has_link_preview:
+            self._qr_btn = QToolButton()
+            self._qr_btn.setObjectName("qrToggleButton")
+            self._qr_btn.setText("QR")
+            self._qr_btn.clicked.connect(self._toggle_qr)
+            self._header.insertWidget(self._header.indexOf(self._reply_btn), self._qr_btn)
         if self._qr_btn is not None:
             self._qr_btn.setVisible(available and not self._has_link_preview)
             self._qr_btn.setToolTip(label)
@@ -1086,8 +1361,6 @@ class ChatBubble(QFrame):
             self._link_preview_qr_btn.setToolTip(label)
 
     def _toggle_qr(self) -> None:
-        if not self._qr_label:
-            return
         if not self._qr_url:
             self._update_qr_code(self.msg.get("text") or "")
             if not self._qr_url:
@@ -1097,30 +1370,22 @@ class ChatBubble(QFrame):
         self._refresh_qr_buttons(True)
 
     def _update_qr_code(self, text: str) -> None:
-        if not self._qr_label:
+        if not self._text_widget:
             return
         if self.msg.get("deleted"):
             url = ""
         else:
             url = self._link_preview_url or extract_first_url(text)
         if not url:
-            self._qr_label.hide()
-            self._qr_label.clear()
-            self._qr_url = None
-            self._qr_visible = False
-            self._refresh_qr_buttons(False)
+            self._clear_qr()
             return
-        if url != self._qr_url or self._qr_label.pixmap() is None:
-            pixmap = generate_qr_pixmap(url, 120)
+        if url != self._qr_url or self._qr_label is None or self._qr_label.pixmap() is None:
+            pixmap = _qr_pixmap(url, 120)
             if pixmap is None or pixmap.isNull():
-                self._qr_label.hide()
-                self._qr_label.clear()
-                self._qr_url = None
-                self._qr_visible = False
-                self._refresh_qr_buttons(False)
+                self._clear_qr()
                 return
             self._qr_url = url
-            self._qr_label.setPixmap(pixmap)
+            self._ensure_qr_label().setPixmap(pixmap)
             self._qr_visible = False
         self._refresh_qr_buttons(True)
         self._qr_label.setVisible(self._qr_visible)
@@ -1147,13 +1412,15 @@ class ChatBubble(QFrame):
         q = (query or "").strip().lower()
         if not q:
             return True
-        fields = [
-            self.msg.get("name") or "",
-            self.msg.get("text") or "",
-            self.msg.get("filename") or "",
-            self.msg.get("reply_preview") or "",
-        ]
-        return any(q in str(field).lower() for field in fields)
+        if self._search_blob is None:
+            fields = (
+                self.msg.get("name") or "",
+                self.msg.get("text") or "",
+                self.msg.get("filename") or "",
+                self.msg.get("reply_preview") or "",
+            )
+            self._search_blob = "\n".join(str(field) for field in fields).lower()
+        return q in self._search_blob
 
     def apply_reaction(self, emoji: str, sender_id: str) -> None:
         if not emoji or not sender_id:
@@ -1165,32 +1432,49 @@ class ChatBubble(QFrame):
         self._render_reactions()
 
     def _render_reactions(self) -> None:
-        while self._reaction_layout.count():
-            item = self._reaction_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
+        if self._reaction_bar is None:
+            if not self._reactions:
+                return
+            self._reaction_bar = QFrame()
+            self._reaction_bar.setObjectName("reactionBar")
+            self._reaction_layout = QHBoxLayout(self._reaction_bar)
+            self._reaction_layout.setContentsMargins(0, 0, 0, 0)
+            self._reaction_layout.setSpacing(6)
+            self._reaction_layout.addStretch(1)
+            self._body.insertWidget(self._body.count() - 1, self._reaction_bar)
+        for emoji in [emoji for emoji in self._reaction_chips if emoji not in self._reactions]:
+            chip, _label = self._reaction_chips.pop(emoji)
+            self._reaction_layout.removeWidget(chip)
+            chip.deleteLater()
         if not self._reactions:
             self._reaction_bar.hide()
             return
         for emoji, senders in self._reactions.items():
+            text = f"{emoji} {len(senders)}"
+            entry = self._reaction_chips.get(emoji)
+            if entry is not None:
+                if entry[1].text() != text:
+                    entry[1].setText(text)
+                continue
             chip = QFrame()
             chip.setObjectName("reactionChip")
             chip_layout = QHBoxLayout(chip)
             chip_layout.setContentsMargins(6, 2, 6, 2)
             chip_layout.setSpacing(4)
-            label = QLabel(f"{emoji} {len(senders)}")
+            label = QLabel(text)
             label.setObjectName("reactionText")
             chip_layout.addWidget(label)
-            self._reaction_layout.addWidget(chip)
-        self._reaction_layout.addStretch(1)
+            self._reaction_layout.insertWidget(self._reaction_layout.count() - 1, chip)
+            self._reaction_chips[emoji] = (chip, label)
         self._reaction_bar.show()
 
     def _open_reaction_menu(self) -> None:
         menu = QMenu(self)
         for emoji in ["👍", "⚡", "🔥", "💬", "✅"]:
-            action = menu.addAction(emoji)
-            action.triggered.connect(lambda _, e=emoji: self.reaction_requested.emit(self.msg, e))
-        menu.exec(self.mapToGlobal(self.rect().bottomRight()))
+            menu.addAction(emoji).setData(emoji)
+        chosen = menu.exec(self.mapToGlobal(self.rect().bottomRight()))
+        if chosen is not None:
+            self.reaction_requested.emit(self.msg, chosen.data())
 
 
 class MainWindow(QMainWindow):
@@ -1206,6 +1490,7 @@ class MainWindow(QMainWindow):
     open_settings = Signal()
     open_about = Signal()
     request_quit = Signal()
+    request_older_history = Signal()
 
     def __init__(self, store: ConfigStore) -> None:
         super().__init__()
@@ -1223,9 +1508,15 @@ class MainWindow(QMainWindow):
         self._typing_timer = QTimer(self)
         self._typing_timer.setSingleShot(True)
         self._typing_timer.timeout.connect(lambda: self._set_typing(False))
+        self._filter_timer = QTimer(self)
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.setInterval(120)
+        self._filter_timer.timeout.connect(self._apply_filter)
         self._peers: list[dict[str, Any]] = []
         self._user_items: dict[str, UserListItem] = {}
         self._stick_to_bottom = True
+        self._has_older_history = False
+        self._scroll_anchor: int | None = None
         self._drag_active = False
         self._drag_offset = QPoint()
         self._lp_current_url: str | None = None
@@ -1318,11 +1609,12 @@ class MainWindow(QMainWindow):
         self._header_label = QLabel(t("app.org_name"))
         self._header_label.setObjectName("headerTitle")
         self._header_label.setAlignment(Qt.AlignCenter)
-        glow = QGraphicsDropShadowEffect(self)
-        glow.setBlurRadius(14)
-        glow.setColor(Qt.green)
-        glow.setOffset(0, 0)
-        self._header_label.setGraphicsEffect(glow)
+        if effects_enabled():
+            glow = QGraphicsDropShadowEffect(self)
+            glow.setBlurRadius(14)
+            glow.setColor(Qt.green)
+            glow.setOffset(0, 0)
+            self._header_label.setGraphicsEffect(glow)
 
         meta_bar = QFrame()
         meta_bar.setObjectName("metaBar")
@@ -1338,7 +1630,7 @@ class MainWindow(QMainWindow):
         self.search_input.setObjectName("searchInput")
         self.search_input.setPlaceholderText(t("search.placeholder"))
         self.search_input.setClearButtonEnabled(True)
-        self.search_input.textChanged.connect(self._apply_filter)
+        self.search_input.textChanged.connect(self._schedule_filter)
 
         meta_layout.addWidget(self.online_label)
         meta_layout.addStretch(1)
@@ -1411,6 +1703,8 @@ class MainWindow(QMainWindow):
         self._chat_bg_image.setGraphicsEffect(self._chat_bg_image_fx)
         self._chat_bg_pixmap: QPixmap | None = None
         self._chat_bg_path: str = ""
+        self._chat_bg_mtime = 0.0
+        self._chat_bg_scaled: OrderedDict[tuple[int, int], QPixmap] = OrderedDict()
 
         chat_stack_layout.addWidget(self._chat_bg_color, 0, 0)
         chat_stack_layout.addWidget(self._chat_bg_image, 0, 0)
@@ -1479,12 +1773,15 @@ class MainWindow(QMainWindow):
         emoji_layout = QHBoxLayout(self.emoji_bar)
         emoji_layout.setContentsMargins(8, 4, 8, 4)
         emoji_layout.setSpacing(6)
+        emoji_mapper = QSignalMapper(self)
+        emoji_mapper.mappedString.connect(self._insert_emoji)
         for emoji in ["😀", "😂", "😉", "😍", "👍", "🔥", "⚡", "✅"]:
             btn = QToolButton()
             btn.setObjectName("emojiButton")
             btn.setText(emoji)
             btn.setToolTip(emoji)
-            btn.clicked.connect(lambda _, e=emoji: self._insert_emoji(e))
+            emoji_mapper.setMapping(btn, emoji)
+            btn.clicked.connect(emoji_mapper.map)
             emoji_layout.addWidget(btn)
         emoji_layout.addStretch(1)
 
@@ -1690,9 +1987,18 @@ class MainWindow(QMainWindow):
             self._chat_bg_image.hide()
         elif mode == "image":
             path = self._store.config.chat_bg_image_path or ""
-            pixmap = QPixmap(path) if path else QPixmap()
+            try:
+                mtime = os.path.getmtime(path) if path else 0.0
+            except OSError:
+                mtime = 0.0
+            if path and path == self._chat_bg_path and mtime == self._chat_bg_mtime and self._chat_bg_pixmap is not None:
+                pixmap = self._chat_bg_pixmap
+            else:
+                pixmap = QPixmap(path) if path else QPixmap()
+                self._chat_bg_scaled.clear()
             if not pixmap.isNull():
                 self._chat_bg_path = path
+                self._chat_bg_mtime = mtime
                 self._chat_bg_pixmap = pixmap
                 self._chat_bg_image_fx.setOpacity(opacity / 100.0)
                 self._chat_bg_image.show()
@@ -1713,11 +2019,19 @@ class MainWindow(QMainWindow):
         size = self.chat_stack.size()
         if size.width() <= 0 or size.height() <= 0:
             return
-        scaled = self._chat_bg_pixmap.scaled(
-            size,
-            Qt.KeepAspectRatioByExpanding,
-            Qt.SmoothTransformation,
-        )
+        key = (size.width(), size.height())
+        scaled = self._chat_bg_scaled.get(key)
+        if scaled is None:
+            scaled = self._chat_bg_pixmap.scaled(
+                size,
+                Qt.KeepAspectRatioByExpanding,
+                Qt.SmoothTransformation,
+            )
+            self._chat_bg_scaled[key] = scaled
+            while len(self._chat_bg_scaled) > 2:
+                self._chat_bg_scaled.popitem(last=False)
+        else:
+            self._chat_bg_scaled.move_to_end(key)
         self._chat_bg_image.setPixmap(scaled)
 
     def set_online_count(self, count: int) -> None:
@@ -1768,10 +2082,68 @@ class MainWindow(QMainWindow):
         self.user_list_layout.addStretch(1)
 
     def add_message(self, msg: dict, sender_ip: str, is_self: bool) -> None:
+        self._add_message_row(msg, sender_ip, is_self)
+        self._update_bubble_widths()
+        self._apply_filter()
+        self._scroll_to_bottom(force=is_self)
+
+    def add_messages_bulk(self, msgs: list[dict], own_sender_id: str, from_history: bool = False) -> None:
+        if not msgs:
+            return
+        self.chat_container.setUpdatesEnabled(False)
+        try:
+            for msg in msgs:
+                self._add_message_row(
+                    msg,
+                    msg.get("sender_ip", ""),
+                    msg.get("sender_id") == own_sender_id,
+                    from_history=from_history,
+                )
+        finally:
+            self.chat_container.setUpdatesEnabled(True)
+        self._update_bubble_widths()
+        self._apply_filter()
+        self._scroll_to_bottom()
+
+    def prepend_messages_bulk(self, msgs: list[dict], own_sender_id: str, from_history: bool = False) -> None:
+        if not msgs:
+            return
+        bar = self.chat_area.verticalScrollBar()
+        self._scroll_anchor = bar.maximum() - bar.value()
+        self.chat_container.setUpdatesEnabled(False)
+        try:
+            for idx, msg in enumerate(msgs):
+                self._add_message_row(
+                    msg,
+                    msg.get("sender_ip", ""),
+                    msg.get("sender_id") == own_sender_id,
+                    index=idx + 1,
+                    from_history=from_history,
+                )
+        finally:
+            self.chat_container.setUpdatesEnabled(True)
+        self._update_bubble_widths()
+        self._apply_filter()
+        QTimer.singleShot(150, self._clear_scroll_anchor)
+
+    def set_has_older_history(self, has_older: bool) -> None:
+        self._has_older_history = bool(has_older)
+
+    def _clear_scroll_anchor(self) -> None:
+        self._scroll_anchor = None
+
+    def _add_message_row(
+        self,
+        msg: dict,
+        sender_ip: str,
+        is_self: bool,
+        index: int | None = None,
+        from_history: bool = False,
+    ) -> None:
         avatar_size = 46
         colors = theme_mod.get_bubble_colors(self._store.config.theme)
         avatar_border = QColor(colors.get("avatar_border", colors.get("bubble_border", "#1B2B22")))
-        avatar_pix = load_avatar_pixmap(
+        avatar_pix = _avatar_pixmap(
             self._store.config.avatar_path if is_self else "",
             msg.get("name") or "",
             msg.get("avatar_sha256") or "",
@@ -1789,7 +2161,7 @@ class MainWindow(QMainWindow):
         avatar_lbl.setScaledContents(True)
         avatar_lbl.setStyleSheet("background: transparent;")
 
-        bubble = ChatBubble(msg, is_self, self._store.config.theme)
+        bubble = ChatBubble(msg, is_self, self._store.config.theme, from_history=from_history)
         bubble.download_requested.connect(lambda m=msg: self._download_file(m, sender_ip))
         bubble.reply_requested.connect(lambda m=msg: self._set_reply(m))
         bubble.reaction_requested.connect(lambda m, e: self._send_reaction(m, e))
@@ -1818,14 +2190,14 @@ class MainWindow(QMainWindow):
             row_layout.addWidget(avatar_lbl, 0, Qt.AlignBottom)
             row_layout.addWidget(bubble, 0, Qt.AlignBottom)
             row_layout.addStretch(1)
-        self.chat_layout.addWidget(row)
+        if index is None:
+            self.chat_layout.addWidget(row)
+        else:
+            self.chat_layout.insertWidget(index, row)
         if self._pinned_message and msg.get("message_id") == self._pinned_message.get("target_id"):
             bubble.set_pinned(True)
         if msg.get("t") == "FILE":
-            self._ensure_image_preview(msg, bubble)
-        self._update_bubble_widths()
-        self._apply_filter()
-        self._scroll_to_bottom(force=is_self)
+            self._ensure_image_preview(msg, bubble, from_history)
 
     def apply_reaction(self, target_id: str, emoji: str, sender_id: str) -> None:
         bubble = self._message_bubbles.get(target_id)
@@ -1873,6 +2245,7 @@ class MainWindow(QMainWindow):
         return dict(self._pinned_message)
 
     def refresh_avatar(self, sender_id: str, avatar_sha: str) -> None:
+        _drop_avatar_pixmaps(avatar_sha)
         colors = theme_mod.get_bubble_colors(self._store.config.theme)
         avatar_border = QColor(colors.get("avatar_border", colors.get("bubble_border", "#1B2B22")))
         for idx in range(self.chat_layout.count()):
@@ -1887,7 +2260,7 @@ class MainWindow(QMainWindow):
                 is_self = bool(avatar_lbl.property("is_self"))
                 avatar_path = self._store.config.avatar_path if is_self else ""
                 size = avatar_lbl.width() or 46
-                pixmap = load_avatar_pixmap(avatar_path, name, avatar_sha, size, avatar_border, 1)
+                pixmap = _avatar_pixmap(avatar_path, name, avatar_sha, size, avatar_border, 1)
                 avatar_lbl.setPixmap(pixmap)
         item = self._user_items.get(sender_id)
         if item:
@@ -2320,7 +2693,15 @@ class MainWindow(QMainWindow):
             self._attachments.remove(path)
             self._refresh_attachments()
 
+    def _schedule_filter(self, text: str) -> None:
+        if text.strip():
+            self._filter_timer.start()
+            return
+        self._filter_timer.stop()
+        self._apply_filter()
+
     def _apply_filter(self) -> None:
+        self._filter_timer.stop()
         query = self.search_input.text()
         for idx in range(self.chat_layout.count()):
             item = self.chat_layout.itemAt(idx)
@@ -2370,8 +2751,19 @@ class MainWindow(QMainWindow):
     def _on_scroll_changed(self, value: int) -> None:
         bar = self.chat_area.verticalScrollBar()
         self._stick_to_bottom = value >= (bar.maximum() - 24)
+        if (
+            self._has_older_history
+            and self._scroll_anchor is None
+            and bar.maximum() > 0
+            and value <= bar.minimum()
+        ):
+            self.request_older_history.emit()
 
     def _on_scroll_range_changed(self, _min: int, _max: int) -> None:
+        if self._scroll_anchor is not None:
+            bar = self.chat_area.verticalScrollBar()
+            bar.setValue(bar.maximum() - self._scroll_anchor)
+            return
         if self._stick_to_bottom:
             self._scroll_to_bottom(force=True)
 
@@ -2661,7 +3053,7 @@ class MainWindow(QMainWindow):
         self._download_threads.append(worker)
         worker.start()
 
-    def _ensure_image_preview(self, msg: dict, bubble: ChatBubble) -> None:
+    def _ensure_image_preview(self, msg: dict, bubble: ChatBubble, from_history: bool = False) -> None:
         filename = msg.get("filename") or ""
         file_id = msg.get("file_id") or ""
         if not _is_image_file(filename) or not file_id:
@@ -2670,7 +3062,7 @@ class MainWindow(QMainWindow):
         if cache_path.exists():
             bubble.set_image_preview(str(cache_path))
             return
-        if msg.get("_from_history"):
+        if from_history:
             return
 
         url = msg.get("url") or ""
@@ -2752,20 +3144,48 @@ def _is_image_file(filename: str) -> bool:
     return suffix in {".png", ".jpg", ".jpeg", ".gif", ".bmp", ".webp"}
 
 
+_NET_POOL = DaemonPool(8, name="net")
+_SSL_CONTEXT = ssl.create_default_context()
+_AVATAR_PIXMAPS: OrderedDict[tuple[str, str, str, int, int, int], QPixmap] = OrderedDict()
+_AVATAR_PIXMAPS_MAX = 256
+_FAST_SCALE_MAX_PX = 96
+_PREVIEW_CACHE: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+_PREVIEW_CACHE_MAX = 256
+_PREVIEW_TTL = 600
+_PREVIEW_CACHE_LOCK = threading.Lock()
+_PREVIEW_DISK: dict[str, dict[str, Any]] | None = None
+_PREVIEW_DISK_MAX_AGE = 7 * 24 * 3600
+_PREVIEW_DISK_MAX = 512
+_PREVIEW_DISK_WRITE_LOCK = threading.Lock()
+_YT_HINT_RE = re.compile(r"youtube\.com|youtu\.be", re.IGNORECASE)
+_FB_HINT_RE = re.compile(r"facebook\.com|fb\.watch", re.IGNORECASE)
+_HTTP_OPENER = urllib.request.build_opener(urllib.request.HTTPSHandler(context=_SSL_CONTEXT))
+
 _LINKPREVIEW_UA = (
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
     "(KHTML, like Gecko) Chrome/120 Safari/537.36"
 )
 _FACEBOOK_UA = "facebookexternalhit/1.1 (+http://www.facebook.com/externalhit_uatext.php)"
 
+_LINKPREVIEW_MAX_HTML = 512 * 1024
+_LINKPREVIEW_MAX_URL = 2048
+_BODY_READ_SIZE = 16 * 1024
+_LINKPREVIEW_RANGE = f"bytes=0-{_LINKPREVIEW_MAX_HTML - 1}"
+_HEAD_END_RE = re.compile(rb"</head\s*>", re.IGNORECASE)
+
+_LINKPREVIEW_ENCODINGS = ", ".join(
+    ["gzip", "deflate"] + (["br"] if brotli is not None else []) + (["zstd"] if zstandard is not None else [])
+)
+
 _LINKPREVIEW_HTML_HEADERS = {
     "User-Agent": _LINKPREVIEW_UA,
     "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-    "Accept-Encoding": "identity",
+    "Accept-Encoding": _LINKPREVIEW_ENCODINGS,
     "Accept-Language": "de-DE,de;q=0.9,en;q=0.8",
     "Cache-Control": "no-cache",
     "Pragma": "no-cache",
 }
+_LINKPREVIEW_FB_HEADERS = {**_LINKPREVIEW_HTML_HEADERS, "User-Agent": _FACEBOOK_UA}
 
 _LINKPREVIEW_IMAGE_HEADERS = {
     "User-Agent": _LINKPREVIEW_UA,
@@ -2888,6 +3308,8 @@ def _pick_image_url(
 
 
 def _is_facebook_host(url: str) -> bool:
+    if not url or not _FB_HINT_RE.search(url):
+        return False
     host = (urllib.parse.urlparse(url or "").netloc or "").lower()
     return host.endswith("facebook.com") or host.endswith("fb.watch")
 
@@ -2899,7 +3321,7 @@ def _fetch_youtube_oembed(url: str) -> dict[str, str] | None:
         endpoint = "https://www.youtube.com/oembed?format=json&url="
         req_url = endpoint + urllib.parse.quote(url, safe="")
         req = urllib.request.Request(req_url, headers=_LINKPREVIEW_HTML_HEADERS)
-        with urllib.request.urlopen(req, timeout=10) as resp:
+        with _HTTP_OPENER.open(req, timeout=10) as resp:
             if resp.status != 200:
                 return None
             raw = resp.read()
@@ -2915,7 +3337,7 @@ def _fetch_youtube_oembed(url: str) -> dict[str, str] | None:
 
 
 def _extract_youtube_id(url: str) -> str:
-    if not url:
+    if not url or not _YT_HINT_RE.search(url):
         return ""
     parsed = urllib.parse.urlparse(url)
     host = (parsed.netloc or "").lower()
@@ -2934,6 +3356,162 @@ def _extract_youtube_id(url: str) -> str:
     return ""
 
 
+def _qr_pixmap(url: str, size: int) -> QPixmap | None:
+    key = f"qr:{size}:{url}"
+    pixmap = QPixmap()
+    if QPixmapCache.find(key, pixmap):
+        return pixmap
+    pixmap = generate_qr_pixmap(url, size)
+    if pixmap is not None and not pixmap.isNull():
+        QPixmapCache.insert(key, pixmap)
+    return pixmap
+
+
+@lru_cache(maxsize=512)
+def _wrapped_text_height(text: str, width: int, font_desc: str) -> int:
+    font = QFont()
+    font.fromString(font_desc)
+    return QFontMetrics(font).boundingRect(0, 0, width, 10_000, Qt.TextWordWrap, text).height()
+
+
+def _avatar_pixmap(
+    avatar_path: str,
+    name: str,
+    avatar_sha: str,
+    size: int,
+    border_color: QColor | None = None,
+    border_width: int = 0,
+) -> QPixmap:
+    key = (
+        avatar_path or "",
+        name or "",
+        avatar_sha or "",
+        size,
+        border_color.rgba() if border_color is not None else 0,
+        border_width,
+    )
+    pixmap = _AVATAR_PIXMAPS.get(key)
+    if pixmap is not None:
+        _AVATAR_PIXMAPS.move_to_end(key)
+        return pixmap
+    pixmap = load_avatar_pixmap(avatar_path, name, avatar_sha, size, border_color, border_width)
+    _AVATAR_PIXMAPS[key] = pixmap
+    while len(_AVATAR_PIXMAPS) > _AVATAR_PIXMAPS_MAX:
+        _AVATAR_PIXMAPS.popitem(last=False)
+    return pixmap
+
+
+def _drop_avatar_pixmaps(avatar_sha: str) -> None:
+    for key in [key for key in _AVATAR_PIXMAPS if key[2] == (avatar_sha or "")]:
+        del _AVATAR_PIXMAPS[key]
+
+
+def _preview_cache_get(key: str) -> dict[str, Any] | None:
+    with _PREVIEW_CACHE_LOCK:
+        entry = _PREVIEW_CACHE.get(key)
+        if entry is None:
+            return None
+        if time.time() - entry[0] >= _PREVIEW_TTL:
+            del _PREVIEW_CACHE[key]
+            return None
+        _PREVIEW_CACHE.move_to_end(key)
+        return dict(entry[1])
+
+
+def _preview_cache_put(key: str, preview: dict[str, Any]) -> None:
+    if _is_private_host(key):
+        return
+    with _PREVIEW_CACHE_LOCK:
+        _PREVIEW_CACHE[key] = (time.time(), dict(preview))
+        _PREVIEW_CACHE.move_to_end(key)
+        while len(_PREVIEW_CACHE) > _PREVIEW_CACHE_MAX:
+            _PREVIEW_CACHE.popitem(last=False)
+
+
+def _preview_disk_key(url: str) -> str:
+    return hashlib.sha1(url.encode("utf-8")).hexdigest()
+
+
+def _preview_disk_entries() -> dict[str, dict[str, Any]]:
+    global _PREVIEW_DISK
+    if _PREVIEW_DISK is None:
+        try:
+            raw = json.loads((cache_dir() / "linkpreviews.json").read_text(encoding="utf-8"))
+        except Exception:
+            raw = {}
+        cutoff = time.time() - _PREVIEW_DISK_MAX_AGE
+        _PREVIEW_DISK = {
+            key: entry
+            for key, entry in (raw.items() if isinstance(raw, dict) else ())
+            if isinstance(entry, dict) and entry.get("fetched_at", 0) >= cutoff
+        }
+    return _PREVIEW_DISK
+
+
+def _preview_disk_get(url: str) -> dict[str, Any] | None:
+    with _PREVIEW_CACHE_LOCK:
+        entry = _preview_disk_entries().get(_preview_disk_key(url))
+        return dict(entry) if entry else None
+
+
+def _preview_disk_put(url: str, preview: dict[str, Any], etag: str, last_modified: str) -> None:
+    if _is_private_host(url):
+        return
+    with _PREVIEW_DISK_WRITE_LOCK:
+        with _PREVIEW_CACHE_LOCK:
+            entries = _preview_disk_entries()
+            now = time.time()
+            entries[_preview_disk_key(url)] = {
+                "etag": etag,
+                "last_modified": last_modified,
+                "fetched_at": now,
+                "preview": dict(preview),
+            }
+            cutoff = now - _PREVIEW_DISK_MAX_AGE
+            for key in [key for key, entry in entries.items() if entry.get("fetched_at", 0) < cutoff]:
+                del entries[key]
+            if len(entries) > _PREVIEW_DISK_MAX:
+                oldest = sorted(entries, key=lambda key: entries[key].get("fetched_at", 0))
+                for key in oldest[: len(entries) - _PREVIEW_DISK_MAX]:
+                    del entries[key]
+            data = json.dumps(entries, ensure_ascii=False)
+        path = cache_dir() / "linkpreviews.json"
+        tmp_path = path.with_name(path.name + ".tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_text(data, encoding="utf-8")
+            os.replace(tmp_path, path)
+        except Exception:
+            pass
+
+
+def _is_private_host(url: str) -> bool:
+    host = urllib.parse.urlparse(url).hostname or ""
+    try:
+        return ipaddress.ip_address(host).is_private
+    except ValueError:
+        return host == "localhost"
+
+
+def _is_previewable_url(url: str) -> bool:
+    if len(url) > _LINKPREVIEW_MAX_URL:
+        return False
+    try:
+        parts = urllib.parse.urlsplit(url)
+        host = parts.hostname
+    except ValueError:
+        return False
+    if parts.scheme not in {"http", "https"} or not host:
+        return False
+    if host == "localhost" or host.endswith(".localhost"):
+        return False
+    try:
+        ip = ipaddress.ip_address(host)
+    except ValueError:
+        return True
+    return not (ip.is_private or ip.is_loopback or ip.is_link_local or ip.is_unspecified or ip.is_reserved)
+
+
 def _normalize_preview_url(url: str) -> str:
     url = (url or "").strip()
     if url.startswith("<") and url.endswith(">") and len(url) > 2:
@@ -2966,11 +3544,19 @@ def _link_thumb_file_id(url: str) -> str:
     return f"lp_{digest[:12]}"
 
 
+def _scale_pixmap(pixmap: QPixmap, size: QSize, aspect_mode: Qt.AspectRatioMode) -> QPixmap:
+    if max(size.width(), size.height()) <= _FAST_SCALE_MAX_PX:
+        coarse = size * 2
+        if pixmap.width() > coarse.width() and pixmap.height() > coarse.height():
+            pixmap = pixmap.scaled(coarse, aspect_mode, Qt.FastTransformation)
+    return pixmap.scaled(size, aspect_mode, Qt.SmoothTransformation)
+
+
 def _set_cover_pixmap(label: QLabel, pixmap: QPixmap) -> None:
     size = label.size()
     if size.width() <= 0 or size.height() <= 0:
         return
-    scaled = pixmap.scaled(size, Qt.KeepAspectRatioByExpanding, Qt.SmoothTransformation)
+    scaled = _scale_pixmap(pixmap, size, Qt.KeepAspectRatioByExpanding)
     x = max(0, (scaled.width() - size.width()) // 2)
     y = max(0, (scaled.height() - size.height()) // 2)
     label.setPixmap(scaled.copy(x, y, size.width(), size.height()))
@@ -3006,7 +3592,7 @@ def create_link_thumb(image_url: str, page_url: str, file_id: str) -> tuple[str
         if _is_facebook_host(page_url or image_url):
             headers["User-Agent"] = _FACEBOOK_UA
         req = urllib.request.Request(image_url, headers=headers)
-        with urllib.request.urlopen(req, timeout=10) as resp:
+        with _HTTP_OPENER.open(req, timeout=10) as resp:
             content_type = (resp.headers.get("Content-Type") or "").lower()
             if "text/html" in content_type:
                 return None, "html response"
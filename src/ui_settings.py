@@ -18,8 +18,9 @@ from PySide6.QtWidgets import (
 
 from config_store import ConfigStore
 from theme import DEFAULT_THEME, THEME_CHOICES
+from ui_common import setup_dialog_layout
 from util.images import load_avatar_pixmap
-from util.i18n import available_languages, set_language, t
+from util.i18n import available_languages, language_indices, set_language, t
 
 
 class SettingsDialog(QDialog):
@@ -38,9 +39,7 @@ class SettingsDialog(QDialog):
         if force:
             self.setWindowFlag(Qt.WindowCloseButtonHint, False)
 
-        layout = QVBoxLayout(self)
-        layout.setSpacing(12)
-        layout.setContentsMargins(14, 12, 14, 12)
+        layout = setup_dialog_layout(self)
 
         name_label = QLabel(t("settings.username"))
         self.name_input = QLineEdit(store.config.user_name)
@@ -72,13 +71,13 @@ class SettingsDialog(QDialog):
 
         language_label = QLabel(t("settings.language"))
         self.language_select = QComboBox()
-        self._language_codes: list[str] = []
-        for code, name in available_languages():
-            self._language_codes.append(code)
-            self.language_select.addItem(name)
+        languages = available_languages()
+        self._language_codes = [code for code, _name in languages]
+        self.language_select.addItems([name for _code, name in languages])
         current_lang = store.config.language or "de-DE"
-        if current_lang in self._language_codes:
-            self.language_select.setCurrentIndex(self._language_codes.index(current_lang))
+        index = language_indices().get(current_lang)
+        if index is not None:
+            self.language_select.setCurrentIndex(index)
 
         chat_bg_label = QLabel(t("settings.chat_bg"))
         self.chat_bg_mode = QComboBox()
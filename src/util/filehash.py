@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import hashlib
+import shutil
 from pathlib import Path
 
 
@@ -9,4 +10,18 @@ def sha256_file(path: str | Path) -> str:
     with open(path, "rb") as f:
         for chunk in iter(lambda: f.read(1024 * 1024), b""):
             h.update(chunk)
-    return h.hexdigest()
+    return h.hexdigest()
+
+
+def copy_file_sha256(src: str | Path, dst: str | Path, buf_size: int = 1024 * 1024) -> str:
+    h = hashlib.sha256()
+    try:
+        with open(src, "rb") as fi, open(dst, "wb") as fo:
+            for chunk in iter(lambda: fi.read(buf_size), b""):
+                h.update(chunk)
+                fo.write(chunk)
+        shutil.copystat(src, dst)
+    except Exception:
+        Path(dst).unlink(missing_ok=True)
+        raise
+    return h.hexdigest()
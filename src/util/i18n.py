@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import json
 import sys
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
@@ -26,11 +27,12 @@ def _lang_dir() -> Path:
     return base / "lang"
 
 
-def available_languages() -> list[tuple[str, str]]:
+@lru_cache(maxsize=1)
+def available_languages() -> tuple[tuple[str, str], ...]:
     langs: list[tuple[str, str]] = []
     lang_dir = _lang_dir()
     if not lang_dir.exists():
-        return [("de-DE", "Deutsch")]
+        return (("de-DE", "Deutsch"),)
     for path in sorted(lang_dir.glob("*.json")):
         try:
             raw = json.loads(path.read_text(encoding="utf-8"))
@@ -40,15 +42,19 @@ def available_languages() -> list[tuple[str, str]]:
         code = meta.get("code") or path.stem
         name = meta.get("name") or code
         langs.append((code, name))
-    return langs
+    return tuple(langs)
+
+
+@lru_cache(maxsize=1)
+def language_indices() -> dict[str, int]:
+    return {code: index for index, (code, _name) in enumerate(available_languages())}
 
 
 def language_code() -> str:
     return _LANG_CODE
 
 
-def load_language(code: str) -> None:
-    global _LANG_CODE, _TRANSLATIONS, _META
+def read_language(code: str) -> tuple[str, dict[str, str], dict[str, Any]]:
     code = _normalize_language_code(code)
     lang_dir = _lang_dir()
     target = lang_dir / f"{code}.json"
@@ -59,10 +65,21 @@ def load_language(code: str) -> None:
         data = json.loads(target.read_text(encoding="utf-8"))
     except Exception:
         data = {}
-    meta = data.get("_meta", {}) if isinstance(data, dict) else {}
-    _TRANSLATIONS = {k: v for k, v in data.items() if isinstance(k, str) and not k.startswith("_")}
-    _META = meta
-    _LANG_CODE = meta.get("code") or target.stem
+    if not isinstance(data, dict):
+        data = {}
+    meta = data.get("_meta", {})
+    translations = {k: v for k, v in data.items() if isinstance(k, str) and not k.startswith("_")}
+    return meta.get("code") or target.stem, translations, meta
+
+
+def install_language(bundle: tuple[str, dict[str, str], dict[str, Any]]) -> None:
+    global _LANG_CODE, _TRANSLATIONS, _META
+    _LANG_CODE, _TRANSLATIONS, _META = bundle
+    _format_cached.cache_clear()
+
+
+def load_language(code: str) -> None:
+    install_language(read_language(code))
 
 
 def set_language(code: str) -> None:
@@ -70,10 +87,22 @@ def set_language(code: str) -> None:
 
 
 def t(key: str, **kwargs: Any) -> str:
+    if not kwargs:
+        return _TRANSLATIONS.get(key) or key
+    try:
+        return _format_cached(_LANG_CODE, key, tuple(sorted(kwargs.items())))
+    except TypeError:
+        return _format(key, kwargs)
+
+
+@lru_cache(maxsize=1024)
+def _format_cached(lang: str, key: str, items: tuple[tuple[str, Any], ...]) -> str:
+    return _format(key, dict(items))
+
+
+def _format(key: str, kwargs: dict[str, Any]) -> str:
     text = _TRANSLATIONS.get(key) or key
-    if kwargs:
-        try:
-            return text.format(**kwargs)
-        except Exception:
-            return text
-    return text
+    try:
+        return text.format(**kwargs)
+    except Exception:
+        return text
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import html
 import re
+from functools import lru_cache
 
 import markdown
 
@@ -129,6 +130,7 @@ def extract_first_url(text: str) -> str:
     return ""
 
 
+@lru_cache(maxsize=1024)
 def render_markdown(text: str) -> str:
     try:
         text = _auto_link(text)
@@ -52,6 +52,10 @@ def attachments_dir() -> Path:
     return app_data_dir() / "attachments"
 
 
+def cache_dir() -> Path:
+    return app_data_dir() / "cache"
+
+
 def attachment_cache_path(file_id: str, filename: str) -> Path:
     suffix = Path(filename).suffix
     return attachments_dir() / f"{file_id}{suffix}"
@@ -89,3 +93,4 @@ def ensure_dirs() -> None:
     downloads_dir().mkdir(parents=True, exist_ok=True)
     avatars_dir().mkdir(parents=True, exist_ok=True)
     attachments_dir().mkdir(parents=True, exist_ok=True)
+    cache_dir().mkdir(parents=True, exist_ok=True)
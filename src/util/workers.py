@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import queue
+import threading
+from typing import Any, Callable
+
+_STOP = object()
+
+
+class DaemonPool:
+    def __init__(self, max_workers: int, name: str = "worker") -> None:
+        self._max = max(1, int(max_workers))
+        self._name = name
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._threads: list[threading.Thread] = []
+        self._idle = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> bool:
+        with self._lock:
+            if self._closed:
+                return False
+            if self._idle == 0 and len(self._threads) < self._max:
+                thread = threading.Thread(
+                    target=self._run,
+                    name=f"{self._name}-{len(self._threads)}",
+                    daemon=True,
+                )
+                self._threads.append(thread)
+                thread.start()
+            elif self._idle:
+                self._idle -= 1
+        self._queue.put((fn, args))
+        return True
+
+    def close(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            count = len(self._threads)
+        for _ in range(count):
+            self._queue.put(_STOP)
+
+    def _run(self) -> None:
+        while True:
+            job = self._queue.get()
+            if job is _STOP:
+                return
+            fn, args = job
+            try:
+                fn(*args)
+            except Exception:
+                pass
+            with self._lock:
+                self._idle += 1